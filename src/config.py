@@ -25,6 +25,19 @@ UNVERIFIED_ROLE: str | None = os.getenv(key="UNVERIFIED_ROLE")
 PLAN_CHANNEL_ID: str | None = os.getenv(key="PLAN_CHANNEL_ID")
 PLAN_SUCCESS_CHANNEL_ID: str | None = os.getenv(key="PLAN_SUCCESS_CHANNEL_ID")
 
+# gateway
+LEAN_GATEWAY: bool = os.getenv(key="LEAN_GATEWAY", default="false").lower() == "true"
+MESSAGE_CACHE_SIZE: int = int(os.getenv(key="MESSAGE_CACHE_SIZE", default="100"))
+
+# sharding (SHARD_IDS="0,1" with SHARD_COUNT runs a range of shards per process)
+SHARDING: bool = os.getenv(key="SHARDING", default="false").lower() == "true"
+SHARD_COUNT: int | None = int(os.getenv(key="SHARD_COUNT") or 0) or None
+SHARD_IDS: list[int] | None = [
+    int(shard_id)
+    for shard_id in os.getenv(key="SHARD_IDS", default="").split(",")
+    if shard_id
+] or None
+
 # logger
 logger.remove()
 logger.add(
@@ -3,6 +3,7 @@ Entry for Discord Bot that acts as a controller for bot events and commands.
 """
 
 # imports
+import functools
 import sys
 
 import discord
@@ -10,24 +11,100 @@ from discord import app_commands
 from discord.ext import commands
 
 import config
+import services.imposter.commands as imposter_commands
 import services.imposter.functions as imposter
+import services.imposter.invite_pool as invite_pool
+import services.shared.executor as executor
 import services.shared.functions as shared
+import services.shared.gateway as gateway
+import services.shared.member_index as member_index
+import services.shared.metrics as metrics
+import services.shared.resolver as resolver
+import services.shared.roster as roster
+import services.shared.router as router
+import services.shared.shards as shards
 import services.spam.functions as spam
 import services.trading_plans.functions as trading_plans
 import services.verify.commands as verify_commands
 import services.verify.functions as verify
+import services.verify.reaction_queue as verify_reactions
+import services.verify.rotation as verify_rotation
 from config import logger
 
-bot = commands.Bot(command_prefix="%", intents=discord.Intents.all())
+if not gateway.is_shard_config_valid():
+    sys.exit(1)
+
+bot = gateway.get_bot_class(commands=commands)(
+    command_prefix="%", **gateway.get_bot_options(discord=discord)
+)
+
+router.add_route(
+    event="message",
+    name="spam",
+    applies=None,
+    handler=functools.partial(spam.check_msg_for_spam, bot=bot, discord=discord),
+)
+router.add_route(
+    event="message",
+    name="trading_plans",
+    applies=trading_plans.in_trading_plan_channel,
+    handler=functools.partial(trading_plans.check_trading_plan, bot=bot),
+)
+router.add_route(
+    event="reaction",
+    name="verify",
+    applies=verify.is_verification_channel,
+    handler=functools.partial(
+        verify_reactions.queue_reaction, bot=bot, discord=discord
+    ),
+)
+
+metrics.add_stats_source(
+    name="clean_username_cache", get_stats=imposter.clean_username_cache_stats
+)
+metrics.add_stats_source(name="executor", get_stats=executor.get_executor_stats)
 
 
 @bot.event
 async def on_ready() -> None:
     """
     Controller for on_ready event.
+    (Sharded bots start each shard from on_shard_ready instead)
+    """
+
+    if not gateway.is_sharded():
+        await start_shard(shard_id=0)
+
+
+@bot.event
+async def on_shard_ready(shard_id: int) -> None:
+    """
+    Controller for on_shard_ready event.
+    """
+
+    await start_shard(shard_id=shard_id)
+
+
+async def start_shard(shard_id: int) -> None:
+    """
+    Sets up a ready shard's guilds, and the bot-wide services with the first
+    ready shard
+
+    Args:
+        shard_id (int): ID of the shard (0 when not sharded)
     """
 
-    await shared.log_in(bot=bot, discord=discord)
+    if shards.shard_ready(bot=bot, shard_id=shard_id):
+        await shared.log_in(bot=bot, discord=discord)
+        await verify.start_verification_store(bot=bot)
+        verify_rotation.start_rotation(bot=bot, discord=discord)
+        spam.start_spam_rule_watcher()
+        metrics.start_metrics_log(bot=bot)
+
+    for guild in shards.get_shard_guilds(bot=bot, shard_id=shard_id):
+        member_index.index_guild(guild=guild)
+        router.build_route_map(guild=guild)
+    await imposter_commands.resume_sweeps(bot=bot, discord=discord, shard_id=shard_id)
 
 
 @bot.event
@@ -36,11 +113,12 @@ async def on_raw_reaction_add(payload) -> None:
     Controller for on_reaction event.
     """
 
-    guild: discord.Guild | None = bot.get_guild(payload.guild_id)
-    channel: discord.GuildChannel | None = guild.get_channel(payload.channel_id)  # type: ignore
-
-    if channel.name == config.VERIFY_CHANNEL:  # type: ignore
-        await verify.check_verification(bot=bot, discord=discord, payload=payload)
+    await router.dispatch(
+        event="reaction",
+        guild=bot.get_guild(payload.guild_id) if payload.guild_id else None,
+        channel_id=payload.channel_id,
+        payload=payload,
+    )
 
 
 @bot.event
@@ -48,6 +126,7 @@ async def on_member_join(member) -> None:
     """
     Controller for on_member_join event.
     """
+    member_index.member_added(member=member)
     await imposter.member_joined(bot=bot, discord=discord, member=member)
 
 
@@ -56,14 +135,107 @@ async def on_member_update(before, after) -> None:
     """
     Controller for on_member_update event.
     """
+    roster.member_updated(before=before, after=after)
     await imposter.member_updated(bot=bot, discord=discord, before=before, after=after)
 
 
+@bot.event
+async def on_member_remove(member) -> None:
+    """
+    Controller for on_member_remove event.
+    """
+    roster.member_removed(member=member)
+    member_index.member_removed(member=member)
+
+
+@bot.event
+async def on_guild_join(guild) -> None:
+    """
+    Controller for on_guild_join event.
+    """
+    member_index.index_guild(guild=guild)
+    router.build_route_map(guild=guild)
+
+
+@bot.event
+async def on_guild_remove(guild) -> None:
+    """
+    Controller for on_guild_remove event.
+    """
+    member_index.remove_guild(guild=guild)
+    invite_pool.remove_guild(guild=guild)
+    router.invalidate(guild_id=guild.id)
+
+
+@bot.event
+async def on_guild_role_update(before, after) -> None:
+    """
+    Controller for on_guild_role_update event.
+    """
+    if before.name != after.name:
+        resolver.invalidate(guild_id=after.guild.id)
+    roster.role_changed(before=before, after=after)
+
+
+@bot.event
+async def on_guild_role_delete(role) -> None:
+    """
+    Controller for on_guild_role_delete event.
+    """
+    resolver.invalidate(guild_id=role.guild.id)
+    roster.role_changed(before=role)
+
+
+@bot.event
+async def on_guild_role_create(role) -> None:
+    """
+    Controller for on_guild_role_create event.
+    """
+    resolver.invalidate(guild_id=role.guild.id)
+
+
+@bot.event
+async def on_guild_channel_create(channel) -> None:
+    """
+    Controller for on_guild_channel_create event.
+    """
+    resolver.invalidate(guild_id=channel.guild.id)
+    router.invalidate(guild_id=channel.guild.id)
+
+
+@bot.event
+async def on_guild_channel_update(before, after) -> None:
+    """
+    Controller for on_guild_channel_update event.
+    """
+    if before.name != after.name:
+        resolver.invalidate(guild_id=after.guild.id)
+        router.invalidate(guild_id=after.guild.id)
+
+
+@bot.event
+async def on_guild_channel_delete(channel) -> None:
+    """
+    Controller for on_guild_channel_delete event.
+    """
+    resolver.invalidate(guild_id=channel.guild.id)
+    router.invalidate(guild_id=channel.guild.id)
+
+
+@bot.event
+async def on_guild_update(before, after) -> None:
+    """
+    Controller for on_guild_update event.
+    """
+    roster.guild_updated(before=before, after=after)
+
+
 @bot.event
 async def on_user_update(before, after) -> None:
     """
     Controller for on_user_update event.
     """
+    roster.user_updated(bot=bot, after=after)
     await imposter.user_updated(bot=bot, discord=discord, before=before, after=after)
 
 
@@ -72,8 +244,13 @@ async def on_message(message) -> None:
     """
     Controller for on_message event.
     """
-    await spam.check_msg_for_spam(bot=bot, discord=discord, message=message)
-    await trading_plans.check_trading_plan(bot=bot, message=message)
+    await router.dispatch(
+        event="message",
+        guild=message.guild,
+        channel_id=message.channel.id,
+        event_channel=message.channel,
+        message=message,
+    )
 
 
 @bot.event
@@ -122,6 +299,17 @@ async def verify_command(
     )
 
 
+@bot.tree.command(name="sweep")
+async def sweep_command(interaction: discord.Interaction) -> None:
+    """
+    Controller for /sweep command.
+    """
+
+    await imposter_commands.command_sweep(
+        discord=discord, bot=bot, interaction=interaction
+    )
+
+
 if __name__ == "__main__":
     if config.BOT_TOKEN is None:
         logger.critical("BOT_TOKEN is not configured.")
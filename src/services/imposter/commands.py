@@ -0,0 +1,321 @@
+"""
+Service for imposter commands
+
+"""
+
+# imports
+import asyncio
+import json
+import os
+import time
+from typing import Any
+
+import services.imposter.functions as imposter
+import services.shared.functions as shared
+import services.shared.gateway as gateway
+import services.shared.log_dispatcher as log_dispatcher
+from config import logger
+from services.imposter.vars import SWEEP_CHUNK_SIZE, SWEEP_PROGRESS_SECONDS
+from services.shared.vars import LOG_PRIORITY_ACTION
+
+SWEEP_CHECKPOINT_FILEPATH: str = os.path.join(
+    os.getcwd(), "src", "services", "imposter", ".sweepCheckpoint.json"
+)
+
+active_sweeps: dict[int, asyncio.Task] = {}
+sweep_checkpoints: dict[str, dict[str, int]] | None = None
+checkpoint_lock = asyncio.Lock()
+
+
+# entry functions
+@logger.catch
+async def command_sweep(discord, bot, interaction) -> None:
+    """
+    Service for sweeping every member of a guild against the current mods.
+    Resumes from the guild's checkpoint if an earlier sweep did not finish.
+
+    Args:
+        discord (_type_): Discord object
+        bot (_type_): Bot object
+        interaction (_type_): Interaction object
+    """
+
+    guild = interaction.guild
+    if guild is None:
+        await interaction.response.send_message(
+            content="Not allowed here.", ephemeral=True
+        )
+        return
+
+    # fetching the mods may chunk the guild, longer than an interaction can wait
+    await interaction.response.defer(ephemeral=True)
+
+    mod_info: tuple[list[str], set[int]] | None = await shared.get_mod_info(
+        bot=bot, guild_id=guild.id
+    )
+    mod_ids: set[int] = mod_info[1] if mod_info is not None else set()
+
+    if interaction.user.id not in mod_ids:
+        await interaction.followup.send(content="Not allowed.", ephemeral=True)
+        return
+
+    if is_sweep_running(guild_id=guild.id):
+        await interaction.followup.send(
+            content="A sweep is already running.", ephemeral=True
+        )
+        return
+
+    checkpoint: dict[str, int] = (await load_sweep_checkpoints()).get(str(guild.id), {})
+    start_sweep(bot=bot, discord=discord, guild=guild)
+
+    response_msg: str = f"Sweep started for {guild.member_count} members."
+    if checkpoint:
+        response_msg = f"Sweep resumed after {checkpoint['checked']} members."
+
+    await interaction.followup.send(content=response_msg, ephemeral=True)
+
+
+@logger.catch
+async def resume_sweeps(bot, discord, shard_id: int) -> None:
+    """
+    Restarts every sweep of a shard's guilds that has a checkpoint (after a bot
+    restart)
+
+    Args:
+        bot (_type_): Bot object
+        discord (_type_): Discord object
+        shard_id (int): ID of the ready shard (0 when not sharded)
+    """
+
+    for guild_id in await load_sweep_checkpoints():
+        guild = bot.get_guild(int(guild_id))
+        if guild is None or guild.shard_id != shard_id:
+            continue
+
+        if not is_sweep_running(guild_id=guild.id):
+            logger.info(f"• RESUMING SWEEP: {guild.name}")
+            start_sweep(bot=bot, discord=discord, guild=guild)
+
+
+# helper functions
+def is_sweep_running(guild_id: int) -> bool:
+    """
+    Checks if a guild has a sweep running
+
+    Args:
+        guild_id (int): ID of the guild
+
+    Returns:
+        bool: A sweep is running
+    """
+
+    task: asyncio.Task | None = active_sweeps.get(guild_id)
+    return task is not None and not task.done()
+
+
+def start_sweep(bot, discord, guild) -> None:
+    """
+    Runs a guild sweep in the background
+
+    Args:
+        bot (_type_): Bot object
+        discord (_type_): Discord object
+        guild (_type_): Guild object
+    """
+
+    active_sweeps[guild.id] = asyncio.create_task(
+        logger.catch(sweep_guild)(bot=bot, discord=discord, guild=guild)
+    )
+
+
+async def sweep_guild(bot, discord, guild) -> None:
+    """
+    Checks every member (in ID order, after the checkpoint) in chunks, saving
+    a checkpoint and yielding to the event loop after each chunk
+
+    Args:
+        bot (_type_): Bot object
+        discord (_type_): Discord object
+        guild (_type_): Guild object
+    """
+
+    await gateway.ensure_chunked(guild=guild)
+
+    checkpoints: dict[str, dict[str, int]] = await load_sweep_checkpoints()
+    checkpoint: dict[str, int] = checkpoints.get(
+        str(guild.id), {"last_member_id": 0, "checked": 0, "flagged": 0}
+    )
+
+    members: list = sorted(
+        (
+            member
+            for member in guild.members
+            if member.id > checkpoint["last_member_id"]
+        ),
+        key=lambda member: member.id,
+    )
+
+    started: float = time.monotonic()
+    last_progress: float = started
+    checked: int = 0
+
+    for start in range(0, len(members), SWEEP_CHUNK_SIZE):
+        chunk: list = members[start : start + SWEEP_CHUNK_SIZE]
+        flagged: int = await sweep_chunk(bot=bot, discord=discord, members=chunk)
+
+        checked += len(chunk)
+        checkpoint = {
+            "last_member_id": chunk[-1].id,
+            "checked": checkpoint["checked"] + len(chunk),
+            "flagged": checkpoint["flagged"] + flagged,
+        }
+        await save_sweep_checkpoint(guild_id=guild.id, checkpoint=checkpoint)
+
+        now: float = time.monotonic()
+        if now - last_progress >= SWEEP_PROGRESS_SECONDS:
+            last_progress = now
+            rate: float = checked / (now - started)
+            logger.info(
+                f"• SWEEP {guild.name}: {checkpoint['checked']} checked, "
+                f"{rate:.0f} members/sec"
+            )
+
+        await asyncio.sleep(0)
+
+    elapsed: float = max(time.monotonic() - started, 1e-9)
+    await save_sweep_checkpoint(guild_id=guild.id, checkpoint=None)
+
+    result_msg: str = (
+        f"🧹  SWEEP DONE - {checkpoint['checked']} members checked, "
+        f"{checkpoint['flagged']} kicked/banned, {checked / elapsed:.0f} members/sec"
+    )
+    logger.info(result_msg)
+    log_dispatcher.queue_log_event(
+        guild=guild, result_msg=result_msg, priority=LOG_PRIORITY_ACTION
+    )
+
+
+async def sweep_chunk(bot, discord, members: list) -> int:
+    """
+    Scores a chunk of members against the mods, logs and queues actions on
+    imposters.
+    Names that are merely too small are not kicked by a sweep.
+
+    Args:
+        bot (_type_): Bot object
+        discord (_type_): Discord object
+        members (list): Members of one guild
+
+    Returns:
+        int: Number of members kicked/banned
+    """
+
+    mod_index, mod_ids = await imposter.get_mod_name_index(
+        bot=bot, guild_id=members[0].guild.id
+    )
+
+    members_to_check: list = [
+        member
+        for member in members
+        if not imposter.is_mod_or_bot(member=member, mod_ids=mod_ids)
+    ]
+    verdicts: list[tuple[int, str]] = imposter.score_members(
+        members=members_to_check,
+        mod_index=mod_index,
+        event_type="SWEEP",
+        kick_small_names=False,
+    )
+
+    actions: list[asyncio.Future] = []
+    for member, (result, result_msg) in zip(members_to_check, verdicts):
+        if result == 0:
+            continue
+
+        await shared.log_event(
+            discord=discord,
+            member=member,
+            result_msg=result_msg,
+            priority=LOG_PRIORITY_ACTION,
+        )
+        actions.append(imposter.handle_imposter(member=member, result=result))
+
+    # wait for the chunk's actions so the checkpoint never skips one
+    await asyncio.gather(*actions)
+
+    return len(actions)
+
+
+async def load_sweep_checkpoints() -> dict[str, dict[str, int]]:
+    """
+    Reads sweep checkpoints from disk once, then serves them from memory
+
+    Returns:
+        dict[str, dict[str, int]]: Guild ID -> checkpoint
+    """
+
+    global sweep_checkpoints  # pylint: disable=global-statement
+
+    if sweep_checkpoints is None:
+        sweep_checkpoints = await asyncio.to_thread(read_sweep_checkpoints)
+
+    return sweep_checkpoints
+
+
+async def save_sweep_checkpoint(
+    guild_id: int, checkpoint: dict[str, int] | None
+) -> None:
+    """
+    Updates (or clears with None) a guild's checkpoint and writes the file
+
+    Args:
+        guild_id (int): ID of the guild
+        checkpoint (dict[str, int] | None): The checkpoint
+    """
+
+    async with checkpoint_lock:
+        checkpoints: dict[str, dict[str, int]] = await load_sweep_checkpoints()
+
+        if checkpoint is None:
+            checkpoints.pop(str(guild_id), None)
+        else:
+            checkpoints[str(guild_id)] = checkpoint
+
+        await asyncio.to_thread(write_sweep_checkpoints, dict(checkpoints))
+
+
+def read_sweep_checkpoints() -> dict[str, dict[str, int]]:
+    """
+    Reads sweep checkpoints from the json file
+
+    Returns:
+        dict[str, dict[str, int]]: Guild ID -> checkpoint
+    """
+
+    values: dict[str, Any] = {}
+
+    try:
+        with open(file=SWEEP_CHECKPOINT_FILEPATH, mode="r", encoding="utf-8") as file:
+            values = json.load(fp=file)
+
+    except FileNotFoundError:
+        pass
+
+    except json.JSONDecodeError:
+        logger.critical("Could not load sweep checkpoints.")
+
+    return values
+
+
+def write_sweep_checkpoints(values: dict[str, dict[str, int]]) -> None:
+    """
+    Writes sweep checkpoints to the json file (temp file + rename)
+
+    Args:
+        values (dict[str, dict[str, int]]): Guild ID -> checkpoint
+    """
+
+    temp_filepath: str = f"{SWEEP_CHECKPOINT_FILEPATH}.tmp"
+    with open(file=temp_filepath, mode="w", encoding="utf-8") as file:
+        json.dump(obj=values, fp=file)
+
+    os.replace(temp_filepath, SWEEP_CHECKPOINT_FILEPATH)
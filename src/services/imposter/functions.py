@@ -3,16 +3,49 @@ Service for catching imposter discord accounts
 """
 
 # imports
-import difflib
-import re
+import asyncio
+import functools
 import string
-from typing import List, Literal
+import time
+from typing import Literal
 
 import unidecode
 
+import services.imposter.invite_pool as invite_pool
+import services.imposter.raid as raid
+import services.imposter.similarity as similarity
+import services.shared.executor as executor
 import services.shared.functions as shared
+import services.shared.roster as roster
 from config import logger
-from services.imposter.vars import IMPOSTER_BAN_MSG, IMPOSTER_KICK_MSG, MAPPING
+from services.imposter.mod_index import ModNameIndex, build_mod_name_index
+from services.imposter.vars import (
+    BAN_THRESHOLD,
+    CLEAN_USERNAME_CACHE_SIZE,
+    IMPOSTER_BAN_MSG,
+    IMPOSTER_KICK_MSG,
+    KICK_THRESHOLD,
+    MAPPING,
+    USER_UPDATE_GUILD_CONCURRENCY,
+    VERDICT_CACHE_SECONDS,
+    VERDICT_CACHE_SIZE,
+)
+from services.shared.vars import (
+    ACTION_PRIORITY_BAN,
+    ACTION_PRIORITY_KICK,
+    LOG_PRIORITY_ACTION,
+    LOG_PRIORITY_INFO,
+)
+
+mod_name_indexes: dict[int, ModNameIndex] = {}
+pass_verdicts: dict[tuple, float] = {}
+punish_tasks: set[asyncio.Task] = set()
+
+# punctuation is dropped, then MAPPING applied, in one str.translate pass
+CLEAN_USERNAME_TABLE: dict[int, str | None] = {
+    **{ord(char): None for char in string.punctuation},
+    **{ord(key): value or None for key, value in MAPPING.items()},
+}
 
 
 # entry functions
@@ -27,6 +60,16 @@ async def member_joined(bot, discord, member) -> None:
         member: The member who joined
     """
 
+    if raid.record_join(guild_id=member.guild.id):
+        raid.buffer_join(
+            guild_id=member.guild.id,
+            member=member,
+            process_batch=lambda members: process_join_batch(
+                bot=bot, discord=discord, members=members
+            ),
+        )
+        return
+
     member_names_to_check = {"username": member.name, "nickname": member.nick}
 
     await username_security_check(
@@ -77,9 +120,29 @@ async def user_updated(bot, discord, before, after) -> None:
     if before.name == after.name and before.display_name == after.display_name:
         return
 
-    member, _ = await shared.user_obj_to_member_obj(bot=bot, user_object=after)
-    if member is None:
-        return
+    members: list = await shared.user_obj_to_member_objs(bot=bot, user_object=after)
+    semaphore = asyncio.Semaphore(USER_UPDATE_GUILD_CONCURRENCY)
+
+    async def check_guild(member) -> None:
+        async with semaphore:
+            await user_updated_in_guild(
+                bot=bot, discord=discord, after=after, member=member
+            )
+
+    await asyncio.gather(*(check_guild(member=member) for member, _ in members))
+
+
+@logger.catch
+async def user_updated_in_guild(bot, discord, after, member) -> None:
+    """
+    Checks an updated user's global names and guild names in one guild
+
+    Args:
+        bot: The bot instance
+        discord: Discord module
+        after: The user after the update
+        member: The user's member object in the guild
+    """
 
     user_names_to_check = {"username": after.name, "nickname": after.global_name}
     invalid_user = await username_security_check(
@@ -118,17 +181,15 @@ async def username_security_check(
         event_type (str): Type of discord event
     """
 
-    mod_names: List[str] = []
-    mod_ids: List[int] = []
+    mod_index, mod_ids = await get_mod_name_index(bot=bot, guild_id=member.guild.id)
 
-    mod_info: tuple[list[str], list[int]] | None = await shared.get_mod_info(
-        bot=bot, guild_id=member.guild.id
-    )
-
-    if mod_info is not None:
-        mod_names, mod_ids = mod_info
+    if is_mod_or_bot(member=member, mod_ids=mod_ids):
+        return False
 
-    if mod_ids is not None and is_mod_or_bot(member=member, mod_ids=mod_ids):
+    verdict_key: tuple = get_verdict_key(
+        member=member, names_to_check=names_to_check, mod_index=mod_index
+    )
+    if is_cached_pass(verdict_key=verdict_key):
         return False
 
     result: Literal[0, 1, 2] = 0
@@ -137,27 +198,245 @@ async def username_security_check(
         discord_username=names_to_check["username"],
         discord_nickname=names_to_check["nickname"],
         discord_id=member.id,
-        mod_names=mod_names,
+        mod_index=mod_index,
         event_type=event_type,
     )
 
-    await shared.log_event(discord=discord, member=member, result_msg=result_msg)
+    await shared.log_event(
+        discord=discord,
+        member=member,
+        result_msg=result_msg,
+        priority=LOG_PRIORITY_ACTION if result != 0 else LOG_PRIORITY_INFO,
+    )
 
     if result != 0:
-        await handle_imposter(member=member, result=result)
+        handle_imposter(member=member, result=result)
         return True
 
+    cache_pass(verdict_key=verdict_key)
     return False
 
 
+async def process_join_batch(bot, discord, members: list) -> None:
+    """
+    Checks a micro-batch of raid joiners against the guild's mods at once, then
+    logs and queues the kicks/bans with the action executor
+
+    Args:
+        bot (_type_): Bot object
+        discord (_type_): Discord object
+        members (list): Members who joined during the raid (same guild)
+    """
+
+    mod_index, mod_ids = await get_mod_name_index(bot=bot, guild_id=members[0].guild.id)
+
+    members_to_check: list = [
+        member
+        for member in members
+        if not is_mod_or_bot(member=member, mod_ids=mod_ids)
+    ]
+    verdicts: list[tuple[int, str]] = score_members(
+        members=members_to_check,
+        mod_index=mod_index,
+        event_type="ON MEMBER JOIN (RAID)",
+    )
+
+    for member, (result, result_msg) in zip(members_to_check, verdicts):
+        await shared.log_event(
+            discord=discord,
+            member=member,
+            result_msg=result_msg,
+            priority=LOG_PRIORITY_ACTION if result != 0 else LOG_PRIORITY_INFO,
+        )
+
+        if result != 0:
+            handle_imposter(member=member, result=result)
+
+
 # helper functions
-def is_mod_or_bot(member, mod_ids: List[int]) -> bool:
+def score_members(
+    members: list,
+    mod_index: ModNameIndex,
+    event_type: str,
+    kick_small_names: bool = True,
+) -> list[tuple[int, str]]:
+    """
+    Scores the username/nickname of many members against the mod index with one
+    similarity matrix
+
+    Args:
+        members (list): Members to check
+        mod_index (ModNameIndex): Moderator name index of the guild
+        event_type (str): The source event handler
+        kick_small_names (bool, optional): Kick when both names are too small.
+            Defaults to True.
+
+    Returns:
+        list[tuple[int, str]]: (result, result message) per member, see is_imposter
+    """
+
+    cleaned_names: list[tuple[str, str]] = [
+        clean_member_names(discord_username=member.name, discord_nickname=member.nick)
+        for member in members
+    ]
+
+    # nickname then username per member, the order get_highest_similarity checks
+    names: list[str] = [
+        name for username, nickname in cleaned_names for name in (nickname, username)
+    ]
+    scores, mod_positions = similarity.score_name_matrix(
+        names=names, mod_index=mod_index
+    )
+
+    verdicts: list[tuple[int, str]] = []
+    for position, member in enumerate(members):
+        cleaned_username, cleaned_nickname = cleaned_names[position]
+        if kick_small_names and names_are_too_small(
+            username=cleaned_username, nickname=cleaned_nickname
+        ):
+            verdicts.append(
+                get_too_small_verdict(discord_id=member.id, event_type=event_type)
+            )
+            continue
+
+        # highest score wins, then the earlier mod, then the nickname
+        row: int = 2 * position
+        user_row: int = row + 1
+        if scores[user_row] > scores[row] or (
+            scores[user_row] == scores[row]
+            and 0 <= mod_positions[user_row] < mod_positions[row]
+        ):
+            row = user_row
+
+        highest_similarity: float = float(scores[row])
+        highest_similarity_name: str = ""
+        if mod_positions[row] >= 0:
+            mod_name: str = mod_index.entries[mod_positions[row]].name
+            highest_similarity_name = (
+                f"{names[row]} is {highest_similarity}% similar to {mod_name}"
+            )
+
+        verdicts.append(
+            get_verdict(
+                highest_similarity=highest_similarity,
+                highest_similarity_name=highest_similarity_name,
+                discord_id=member.id,
+                event_type=event_type,
+            )
+        )
+
+    return verdicts
+
+
+async def get_mod_name_index(bot, guild_id: int) -> tuple[ModNameIndex, set[int]]:
+    """
+    Gets the guild's moderator names, normalized like joiner names, rebuilding
+    them only when the mod roster changed
+
+    Args:
+        bot (_type_): Bot object
+        guild_id (int): ID of the guild
+
+    Returns:
+        tuple[ModNameIndex, set[int]]: Moderator name index, moderator IDs
+    """
+
+    mod_names: list[str] = []
+    mod_ids: set[int] = set()
+
+    mod_info: tuple[list[str], set[int]] | None = await shared.get_mod_info(
+        bot=bot, guild_id=guild_id
+    )
+
+    if mod_info is not None:
+        mod_names, mod_ids = mod_info
+
+    version: int | None = roster.get_roster_version(guild_id=guild_id)
+    mod_index: ModNameIndex | None = mod_name_indexes.get(guild_id)
+
+    if mod_index is None or version is None or mod_index.version != version:
+        mod_index = build_mod_name_index(
+            mod_names=mod_names, version=version, normalize=clean_username
+        )
+        mod_name_indexes[guild_id] = mod_index
+
+    return mod_index, mod_ids
+
+
+def get_verdict_key(member, names_to_check, mod_index: ModNameIndex) -> tuple:
+    """
+    Builds the verdict cache key of a name check
+
+    Args:
+        member (_type_): Discord member object
+        names_to_check (_type_): {"username": ..., "nickname": ...}
+        mod_index (ModNameIndex): Moderator name index the check runs against
+
+    Returns:
+        tuple: (guild ID, user ID, cleaned username, cleaned nickname, roster version)
+    """
+
+    cleaned_username, cleaned_nickname = clean_member_names(
+        discord_username=names_to_check["username"],
+        discord_nickname=names_to_check["nickname"],
+    )
+
+    return (
+        member.guild.id,
+        member.id,
+        cleaned_username,
+        cleaned_nickname,
+        mod_index.version,
+    )
+
+
+def is_cached_pass(verdict_key: tuple) -> bool:
+    """
+    Checks if the same names already passed against the same roster.
+    Only passes are cached: kicked/banned members are gone, and a rejoin
+    should be checked, logged and acted on again.
+
+    Args:
+        verdict_key (tuple): Key from get_verdict_key
+
+    Returns:
+        bool: An unexpired pass verdict is cached
+    """
+
+    expires: float | None = pass_verdicts.get(verdict_key)
+    if expires is None:
+        return False
+
+    if expires < time.monotonic():
+        del pass_verdicts[verdict_key]
+        return False
+
+    return True
+
+
+def cache_pass(verdict_key: tuple) -> None:
+    """
+    Caches a pass verdict for VERDICT_CACHE_SECONDS
+
+    Args:
+        verdict_key (tuple): Key from get_verdict_key
+    """
+
+    pass_verdicts.pop(verdict_key, None)
+    pass_verdicts[verdict_key] = time.monotonic() + VERDICT_CACHE_SECONDS
+
+    # oldest entries first (insertion order)
+    while len(pass_verdicts) > VERDICT_CACHE_SIZE:
+        del pass_verdicts[next(iter(pass_verdicts))]
+
+
+def is_mod_or_bot(member, mod_ids: set[int]) -> bool:
     """
     Checks if member is a mod or a bot
 
     Args:
         member (_type_): _description_
-        mod_ids (List[int]): Moderator IDs of the server
+        mod_ids (set[int]): Moderator IDs of the server
 
     Returns:
         bool: Is member a mod or a bot
@@ -177,41 +456,56 @@ def clean_username(username: str) -> str:
         str: The cleaned username string
     """
 
-    cleaned_username: str = re.sub(
-        pattern=f"[{re.escape(pattern=string.punctuation)}]", repl="", string=username
-    )
+    return clean_username_cached(username)
+
+
+@functools.lru_cache(maxsize=CLEAN_USERNAME_CACHE_SIZE)
+def clean_username_cached(username: str) -> str:
+    """
+    Memoized clean_username (names repeat a lot during join raids)
 
-    for key, value in MAPPING.items():
-        cleaned_username = cleaned_username.replace(key, value)
+    Args:
+        username (str): The name that is getting cleaned
 
+    Returns:
+        str: The cleaned username string
+    """
+
+    # MAPPING keys are matched before NFKD splits them (ジ -> シ + mark), and
+    # again on the skeleton for the digits/punctuation look-alikes turn into
+    cleaned_username: str = username.translate(CLEAN_USERNAME_TABLE)
+    cleaned_username = shared.skeleton(text=cleaned_username)
+    cleaned_username = cleaned_username.translate(CLEAN_USERNAME_TABLE)
     cleaned_username = unidecode.unidecode(string=cleaned_username).lower()
 
     return cleaned_username
 
 
-def get_name_similarity(string1, string2) -> float:
+def clean_username_cache_stats() -> dict[str, float]:
     """
-    Compares the mod name and the given username
-
-    Args:
-        string1 (str): The username
-        string2 (str): The mod's username
+    Gets the clean_username cache stats, for sizing CLEAN_USERNAME_CACHE_SIZE
 
     Returns:
-        float: % Similarity of string1 and string2
+        dict[str, float]: Hits, misses, current size, max size and hit rate
     """
 
-    matcher = difflib.SequenceMatcher(isjunk=None, a=string1, b=string2)
-    similarity: float = round(number=matcher.ratio() * 100, ndigits=2)
+    info = clean_username_cached.cache_info()
+    lookups: int = info.hits + info.misses
 
-    return similarity
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize or 0,
+        "hit_rate": round(number=info.hits / lookups, ndigits=4) if lookups else 0.0,
+    }
 
 
 def is_imposter(
     discord_username: str,
     discord_nickname: str,
     discord_id: int,
-    mod_names: List[str],
+    mod_index: ModNameIndex,
     event_type: str,
 ) -> tuple[Literal[1], str] | tuple[Literal[2], str] | tuple[Literal[0], str]:
     """
@@ -221,7 +515,7 @@ def is_imposter(
         discord_username (str): The discord username of member
         discord_nickname (str): The discord nickname of member
         discord_id (int): The ID of the member
-        mod_names (List[str]): The list of moderator names
+        mod_index (ModNameIndex): Moderator name index of the guild
         event_type (str): The source event handler
 
     Returns:
@@ -233,34 +527,98 @@ def is_imposter(
          ResultMSG: The highest similarity % and name
     """
 
-    has_nickname = discord_nickname is not None and discord_nickname.lower() != "none"
-    cleaned_username: str = clean_username(username=discord_username)
-    cleaned_nickname: str = (
-        clean_username(username=discord_nickname) if has_nickname else cleaned_username
+    cleaned_username, cleaned_nickname = clean_member_names(
+        discord_username=discord_username, discord_nickname=discord_nickname
     )
 
     logger.info(
         f"• CHECKING NAMES {event_type}: {cleaned_username}, {cleaned_nickname}"
     )
     if names_are_too_small(username=cleaned_username, nickname=cleaned_nickname):
-        message: str = (
-            f"🟥  KICKED {event_type} - BOTH USERNAMES TOO SMALL <@{discord_id}>"
-        )
-        logger.info(message)
-        return 1, message
+        return get_too_small_verdict(discord_id=discord_id, event_type=event_type)
 
     highest_similarity: float
     highest_similarity_name: str
     highest_similarity, highest_similarity_name = get_highest_similarity(
-        username=cleaned_username, nickname=cleaned_nickname, mod_names=mod_names
+        username=cleaned_username, nickname=cleaned_nickname, mod_index=mod_index
+    )
+
+    return get_verdict(
+        highest_similarity=highest_similarity,
+        highest_similarity_name=highest_similarity_name,
+        discord_id=discord_id,
+        event_type=event_type,
     )
 
-    if highest_similarity >= 87.00:
+
+def clean_member_names(
+    discord_username: str, discord_nickname: str | None
+) -> tuple[str, str]:
+    """
+    Cleans a username/nickname pair (the username stands in for a missing nickname)
+
+    Args:
+        discord_username (str): The discord username of member
+        discord_nickname (str | None): The discord nickname of member
+
+    Returns:
+        tuple[str, str]: Cleaned username, cleaned nickname
+    """
+
+    has_nickname = discord_nickname is not None and discord_nickname.lower() != "none"
+    cleaned_username: str = clean_username(username=discord_username)
+    cleaned_nickname: str = (
+        clean_username(username=discord_nickname)  # type: ignore
+        if has_nickname
+        else cleaned_username
+    )
+
+    return cleaned_username, cleaned_nickname
+
+
+def get_too_small_verdict(discord_id: int, event_type: str) -> tuple[Literal[1], str]:
+    """
+    Kick verdict for names that are too small to compare
+
+    Args:
+        discord_id (int): The ID of the member
+        event_type (str): The source event handler
+
+    Returns:
+        tuple[Literal[1], str]: KICK, ResultMSG
+    """
+
+    message: str = f"🟥  KICKED {event_type} - BOTH USERNAMES TOO SMALL <@{discord_id}>"
+    logger.info(message)
+    return 1, message
+
+
+def get_verdict(
+    highest_similarity: float,
+    highest_similarity_name: str,
+    discord_id: int,
+    event_type: str,
+) -> tuple[Literal[1], str] | tuple[Literal[2], str] | tuple[Literal[0], str]:
+    """
+    Turns the highest similarity % into a ban/kick/pass result
+
+    Args:
+        highest_similarity (float): The highest similarity %
+        highest_similarity_name (str): Description of the closest name/mod pair
+        discord_id (int): The ID of the member
+        event_type (str): The source event handler
+
+    Returns:
+        tuple[Literal[1], str] | tuple[Literal[2], str] | tuple[Literal[0], str]:
+         Results: 2 = BAN, 1 = KICK, 0 = PASS and the ResultMSG
+    """
+
+    if highest_similarity >= BAN_THRESHOLD:
         message = f"🟥  BANNED {event_type} - {highest_similarity_name} <@{discord_id}>"
         logger.info(message)
         return 2, message
 
-    elif highest_similarity >= 70.00:
+    elif highest_similarity >= KICK_THRESHOLD:
         message = f"🟥  KICKED {event_type} - {highest_similarity_name} <@{discord_id}>"
         logger.info(message)
         return 1, message
@@ -286,15 +644,15 @@ def names_are_too_small(username: str, nickname: str) -> bool:
 
 
 def get_highest_similarity(
-    username: str, nickname: str, mod_names: List[str]
+    username: str, nickname: str, mod_index: ModNameIndex
 ) -> tuple[float, str]:
     """
-    Loops through mod names and compares user nicknames/usernames
+    Compares user nicknames/usernames against all mod names in one pass
 
     Args:
         username (str): The discord username
         nickname (str): The discord nickname
-        mod_names (List[str]): List of moderator names
+        mod_index (ModNameIndex): Moderator name index of the guild
 
     Returns:
         tuple[float, str]:
@@ -302,56 +660,96 @@ def get_highest_similarity(
         The username or nickname with the highest similarity %
     """
 
-    highest_similarity: float = 0.00
+    highest_similarity, name, mod = similarity.get_highest_similarity(
+        names=[("nick", nickname), ("user", username)], mod_index=mod_index
+    )
+
     highest_similarity_name: str = ""
+    if name or mod:
+        highest_similarity_name = f"{name} is {highest_similarity}% similar to {mod}"
 
-    for mod in mod_names:
-        nickname_similarity: float = get_name_similarity(string1=nickname, string2=mod)
-        logger.info(f"{nickname_similarity}% {nickname} (nick) vs {mod}")
+    return highest_similarity, highest_similarity_name
 
-        if nickname_similarity > highest_similarity:
-            highest_similarity = nickname_similarity
-            highest_similarity_name = (
-                f"{nickname} is {nickname_similarity}% similar to {mod}"
-            )
 
-        username_similarity: float = get_name_similarity(string1=username, string2=mod)
-        logger.info(f"{username_similarity}% {username} (nick) vs {mod}")
+def handle_imposter(member, result: int) -> asyncio.Future:
+    """
+    DMs the imposter, then bans=2 or kicks=1 based on result, each as its own
+    action with the action executor
 
-        if username_similarity > highest_similarity:
-            highest_similarity = username_similarity
-            highest_similarity_name = (
-                f"{username} is {username_similarity}% similar to {mod}"
-            )
+    Args:
+        member (_type_): _description_
+        result (int): The result type from checking similarity %
 
-    return highest_similarity, highest_similarity_name
+    Returns:
+        asyncio.Future: Resolves to True once the kick/ban went through
+    """
+
+    task: asyncio.Task = asyncio.create_task(
+        logger.catch(punish_imposter)(member=member, result=result)
+    )
+    punish_tasks.add(task)
+    task.add_done_callback(punish_tasks.discard)
+
+    return task
 
 
-async def handle_imposter(member, result: int) -> None:
+async def punish_imposter(member, result: int) -> bool:
     """
-    Bans=2 or kicks=1 based on result
+    Queues the imposter's DM (best effort) and waits for it, then queues the
+    ban=2 or kick=1, so a retried kick/ban never DMs twice
 
     Args:
         member (_type_): _description_
         result (int): The result type from checking similarity %
+
+    Returns:
+        bool: The kick/ban went through
     """
 
     guild = member.guild
-    dm_channel = await member.create_dm()
-    invite_url = await guild.text_channels[0].create_invite(max_age=600, max_uses=5)
+    is_ban: bool = result == 2
+    priority: int = ACTION_PRIORITY_BAN if is_ban else ACTION_PRIORITY_KICK
+
+    try:
+        dm_msg: str = (
+            IMPOSTER_BAN_MSG
+            if is_ban
+            else f"{IMPOSTER_KICK_MSG}{await invite_pool.get_invite_url(guild=guild)}"
+        )
+
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.info(f"• COULD NOT DM IMPOSTER: {member} --- {e}")
+
+    else:
+        # at the kick/ban's own priority: the member can only be DMed while
+        # they still share the guild, and the kick/ban waits for the DM
+        await executor.submit(
+            guild_id=guild.id,
+            priority=priority,
+            route=f"dm:{guild.id}",
+            action=functools.partial(send_imposter_dm, member=member, dm_msg=dm_msg),
+        )
+
+    return await executor.submit(
+        guild_id=guild.id,
+        priority=priority,
+        route=f"{'ban' if is_ban else 'kick'}:{guild.id}",
+        action=(
+            functools.partial(member.ban, reason=IMPOSTER_BAN_MSG)
+            if is_ban
+            else functools.partial(member.kick, reason=IMPOSTER_KICK_MSG)
+        ),
+    )
 
-    if result == 1:  # kick user
-        if dm_channel is not None:
-            try:
-                await dm_channel.send(f"{IMPOSTER_KICK_MSG}{invite_url}")
 
-            finally:
-                await member.kick(reason=IMPOSTER_KICK_MSG)
+async def send_imposter_dm(member, dm_msg: str) -> None:
+    """
+    DMs an imposter before they are kicked/banned
 
-    elif result == 2:  # ban user
-        try:
-            if dm_channel is not None:
-                await dm_channel.send(IMPOSTER_BAN_MSG)
+    Args:
+        member (_type_): _description_
+        dm_msg (str): The message, with the invite already in it for kicks
+    """
 
-        finally:
-            await member.ban(reason=IMPOSTER_BAN_MSG)
+    dm_channel = await member.create_dm()
+    await dm_channel.send(dm_msg)
@@ -0,0 +1,185 @@
+"""
+Per-guild pool of invites for kicked imposters.
+
+A guild's pool is only started by its first kick. After that, kicks are handed
+an invite from memory and the next invite is created in the background before
+the current one expires or runs out of uses. Every hand-out counts as a use.
+A guild has at most one invite being created at a time, through the action
+executor; kicks that find the pool empty all wait for that one.
+"""
+
+# imports
+import asyncio
+import functools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import services.shared.executor as executor
+from services.imposter.vars import (
+    INVITE_MAX_AGE,
+    INVITE_MAX_USES,
+    INVITE_MIN_LIFETIME,
+    INVITE_ROTATE_SECONDS,
+    INVITE_ROTATE_USES,
+)
+from services.shared.vars import ACTION_PRIORITY_KICK
+
+
+@dataclass
+class PooledInvite:
+    """
+    An invite and how long/often it can still be handed out
+    """
+
+    url: str
+    expires_at: float
+    uses_left: int
+
+
+@dataclass
+class InvitePool:
+    """
+    Invites of a guild, oldest first
+    """
+
+    invites: deque = field(default_factory=deque)
+    creation: asyncio.Future | None = None
+
+
+invite_pools: dict[int, InvitePool] = {}
+
+
+# entry functions
+async def get_invite_url(guild) -> str:
+    """
+    Hands out an invite for a kicked imposter, waiting for the guild's invite
+    creation only if the pool has none left
+
+    Args:
+        guild (_type_): Guild object
+
+    Returns:
+        str: Invite URL
+
+    Raises:
+        RuntimeError: No invite could be created
+    """
+
+    pool: InvitePool = invite_pools.setdefault(guild.id, InvitePool())
+
+    invite_url: str | None = take_invite(pool=pool, now=time.monotonic())
+    while invite_url is None:
+        # shielded, one waiter being cancelled must not cancel it for the rest
+        if not await asyncio.shield(start_creation(guild=guild, pool=pool)):
+            raise RuntimeError(f"could not create an invite for {guild.name}")
+
+        invite_url = take_invite(pool=pool, now=time.monotonic())
+
+    if needs_rotation(pool=pool, now=time.monotonic()):
+        start_creation(guild=guild, pool=pool)
+
+    return invite_url
+
+
+def remove_guild(guild) -> None:
+    """
+    Drops the pool of a guild the bot left
+
+    Args:
+        guild (_type_): Guild object
+    """
+
+    pool: InvitePool | None = invite_pools.pop(guild.id, None)
+    if pool is not None and pool.creation is not None:
+        pool.creation.cancel()
+
+
+# helper functions
+def take_invite(pool: InvitePool, now: float) -> str | None:
+    """
+    Uses up one hand-out of the oldest invite that is still good
+
+    Args:
+        pool (InvitePool): The guild's pool
+        now (float): time.monotonic()
+
+    Returns:
+        str | None: Invite URL, None if the pool is empty
+    """
+
+    while pool.invites:
+        invite: PooledInvite = pool.invites[0]
+
+        if invite.uses_left > 0 and invite.expires_at - now > INVITE_MIN_LIFETIME:
+            invite.uses_left -= 1
+            return invite.url
+
+        pool.invites.popleft()
+
+    return None
+
+
+def needs_rotation(pool: InvitePool, now: float) -> bool:
+    """
+    Checks if the pool is about to run out of usable invites
+
+    Args:
+        pool (InvitePool): The guild's pool
+        now (float): time.monotonic()
+
+    Returns:
+        bool: The next invite should be created
+    """
+
+    uses_left: int = sum(
+        invite.uses_left
+        for invite in pool.invites
+        if invite.expires_at - now > INVITE_ROTATE_SECONDS
+    )
+    return uses_left <= INVITE_ROTATE_USES
+
+
+def start_creation(guild, pool: InvitePool) -> asyncio.Future:
+    """
+    Starts creating the guild's next invite, unless one is already on the way
+
+    Args:
+        guild (_type_): Guild object
+        pool (InvitePool): The guild's pool
+
+    Returns:
+        asyncio.Future: Resolves to True once the invite is in the pool
+    """
+
+    if pool.creation is None or pool.creation.done():
+        # at kick priority, kicked imposters wait for it
+        pool.creation = executor.submit(
+            guild_id=guild.id,
+            priority=ACTION_PRIORITY_KICK,
+            route=f"invite:{guild.id}",
+            action=functools.partial(add_invite, guild=guild, pool=pool),
+        )
+
+    return pool.creation
+
+
+async def add_invite(guild, pool: InvitePool) -> None:
+    """
+    Creates an invite and adds it to the pool
+
+    Args:
+        guild (_type_): Guild object
+        pool (InvitePool): The guild's pool
+    """
+
+    invite = await guild.text_channels[0].create_invite(
+        max_age=INVITE_MAX_AGE, max_uses=INVITE_MAX_USES
+    )
+    pool.invites.append(
+        PooledInvite(
+            url=str(object=invite),
+            expires_at=time.monotonic() + INVITE_MAX_AGE,
+            uses_left=INVITE_MAX_USES,
+        )
+    )
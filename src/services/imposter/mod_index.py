@@ -0,0 +1,95 @@
+"""
+Normalized moderator-name index for the imposter service
+"""
+
+# imports
+import difflib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class ModName:
+    """
+    A normalized moderator name and its precomputed features
+    """
+
+    name: str
+    length: int
+    histogram: Counter
+    matcher: difflib.SequenceMatcher = field(compare=False, repr=False)
+
+
+@dataclass(frozen=True)
+class ModNameIndex:
+    """
+    Normalized moderator names of a guild for one roster version
+    """
+
+    version: int | None
+    entries: tuple[ModName, ...]
+    char_postings: dict[str, tuple[tuple[int, int], ...]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+
+def build_mod_name_index(
+    mod_names: list[str], version: int | None, normalize: Callable[[str], str]
+) -> ModNameIndex:
+    """
+    Normalizes moderator names and precomputes their features
+
+    Args:
+        mod_names (list[str]): Moderator names from the roster
+        version (int | None): Roster version the names come from
+        normalize (Callable[[str], str]): Normalizer used for joiner names
+
+    Returns:
+        ModNameIndex: The index, with an inverted index of character ->
+        (entry position, count) postings
+    """
+
+    entries: list[ModName] = []
+    seen: set[str] = set()
+
+    for mod_name in mod_names:
+        name: str = normalize(mod_name)
+        if not name or name in seen:
+            continue
+
+        seen.add(name)
+        entries.append(build_mod_name(name=name))
+
+    char_postings: dict[str, list[tuple[int, int]]] = {}
+    for position, entry in enumerate(entries):
+        for char, count in entry.histogram.items():
+            char_postings.setdefault(char, []).append((position, count))
+
+    return ModNameIndex(
+        version=version,
+        entries=tuple(entries),
+        char_postings={
+            char: tuple(postings) for char, postings in char_postings.items()
+        },
+    )
+
+
+def build_mod_name(name: str) -> ModName:
+    """
+    Precomputes the features of a normalized name
+
+    Args:
+        name (str): Normalized name
+
+    Returns:
+        ModName: Name with its length, character histogram and a
+        SequenceMatcher with the name preloaded as the second sequence
+    """
+
+    return ModName(
+        name=name,
+        length=len(name),
+        histogram=Counter(name),
+        matcher=difflib.SequenceMatcher(isjunk=None, a="", b=name),
+    )
@@ -0,0 +1,151 @@
+"""
+Join-raid mode for the imposter service.
+
+Joins are counted per guild in a sliding window. Once the rate passes
+RAID_JOIN_THRESHOLD the guild is in raid mode: joiners are buffered and handed
+to a batch callback in micro-batches instead of being checked one by one. Raid
+mode ends by itself once the buffer is drained and the rate drops below
+RAID_EXIT_THRESHOLD.
+"""
+
+# imports
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from config import logger
+from services.imposter.vars import (
+    RAID_BATCH_SECONDS,
+    RAID_BATCH_SIZE,
+    RAID_EXIT_THRESHOLD,
+    RAID_JOIN_THRESHOLD,
+    RAID_WINDOW_SECONDS,
+)
+
+BatchCallback = Callable[[list[Any]], Awaitable[None]]
+
+
+@dataclass
+class RaidState:
+    """
+    Join rate and raid buffer of a guild
+    """
+
+    joins: deque = field(default_factory=deque)
+    active: bool = False
+    buffer: list[Any] = field(default_factory=list)
+    batch_ready: asyncio.Event = field(default_factory=asyncio.Event)
+    worker: asyncio.Task | None = None
+
+
+raid_states: dict[int, RaidState] = {}
+
+
+# entry functions
+def record_join(guild_id: int) -> bool:
+    """
+    Counts a join and switches the guild into raid mode on a spike
+
+    Args:
+        guild_id (int): ID of the guild
+
+    Returns:
+        bool: The guild is in raid mode
+    """
+
+    state: RaidState = raid_states.setdefault(guild_id, RaidState())
+    join_rate: int = count_join(state=state, now=time.monotonic())
+
+    if not state.active and join_rate >= RAID_JOIN_THRESHOLD:
+        state.active = True
+        logger.warning(f"• RAID MODE ON: guild {guild_id}, {join_rate} joins")
+
+    return state.active
+
+
+def buffer_join(guild_id: int, member, process_batch: BatchCallback) -> None:
+    """
+    Buffers a joiner for the next raid batch
+
+    Args:
+        guild_id (int): ID of the guild
+        member (_type_): The member who joined
+        process_batch (BatchCallback): Checks and acts on a batch of members
+    """
+
+    state: RaidState = raid_states.setdefault(guild_id, RaidState())
+    state.buffer.append(member)
+
+    if len(state.buffer) >= RAID_BATCH_SIZE:
+        state.batch_ready.set()
+
+    if state.worker is None or state.worker.done():
+        state.worker = asyncio.create_task(
+            run_raid_batches(guild_id=guild_id, process_batch=process_batch)
+        )
+
+
+# helper functions
+def count_join(state: RaidState, now: float, joined: bool = True) -> int:
+    """
+    Records a join (optionally) and drops joins outside the window
+
+    Args:
+        state (RaidState): Raid state of the guild
+        now (float): Monotonic time
+        joined (bool, optional): Record a join. Defaults to True.
+
+    Returns:
+        int: Joins within RAID_WINDOW_SECONDS
+    """
+
+    if joined:
+        state.joins.append(now)
+
+    while state.joins and now - state.joins[0] > RAID_WINDOW_SECONDS:
+        state.joins.popleft()
+
+    return len(state.joins)
+
+
+async def run_raid_batches(guild_id: int, process_batch: BatchCallback) -> None:
+    """
+    Hands buffered joiners to process_batch until the raid is over
+
+    Args:
+        guild_id (int): ID of the guild
+        process_batch (BatchCallback): Checks and acts on a batch of members
+    """
+
+    state: RaidState = raid_states[guild_id]
+
+    while True:
+        # asyncio.wait, unlike wait_for, never swallows a cancellation
+        waiter: asyncio.Task = asyncio.create_task(state.batch_ready.wait())
+        try:
+            await asyncio.wait({waiter}, timeout=RAID_BATCH_SECONDS)
+        finally:
+            waiter.cancel()
+
+        state.batch_ready.clear()
+        batch: list[Any] = state.buffer[:RAID_BATCH_SIZE]
+        del state.buffer[:RAID_BATCH_SIZE]
+
+        if batch:
+            try:
+                await process_batch(batch)
+
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error(f"• RAID BATCH FAILED: guild {guild_id} --- {e}")
+
+        if state.buffer:
+            state.batch_ready.set()
+            continue
+
+        join_rate: int = count_join(state=state, now=time.monotonic(), joined=False)
+        if join_rate < RAID_EXIT_THRESHOLD:
+            state.active = False
+            logger.warning(f"• RAID MODE OFF: guild {guild_id}")
+            return
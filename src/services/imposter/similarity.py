@@ -0,0 +1,269 @@
+"""
+Threshold-aware name similarity for the imposter service.
+
+Scores match difflib.SequenceMatcher(a=name, b=mod).ratio() as a % rounded to
+2 places. Candidate mods are pulled from the index's character postings with an
+upper bound (shared character multiset) and only those that can reach the kick
+threshold are scored exactly, best bound first, stopping once the ban
+threshold is reached or no remaining bound can beat the current best.
+
+score_name_matrix does the same for many names at once, computing the bounds
+for every (name, mod) pair as NumPy matrices.
+"""
+
+# imports
+from collections import Counter
+
+import numpy as np
+
+from config import logger
+from services.imposter.mod_index import ModName, ModNameIndex
+from services.imposter.vars import BAN_THRESHOLD, KICK_THRESHOLD
+
+# slack for comparing unrounded matrix bounds with 2-place rounded scores
+BOUND_MARGIN: float = 0.01
+
+
+def get_candidate_bounds(
+    histogram: Counter, length: int, mod_index: ModNameIndex, floor: float
+) -> list[tuple[float, int]]:
+    """
+    Pulls the mods that could reach floor from the index's character postings
+
+    The bound is difflib's quick_ratio (shared character multiset), which never
+    underestimates the exact score, so no mod that could reach floor is left
+    out. Mods sharing no character with the name are never touched.
+
+    Args:
+        histogram (Counter): Character counts of the name
+        length (int): Length of the name
+        mod_index (ModNameIndex): Mod name index of the guild
+        floor (float): Lowest % worth scoring
+
+    Returns:
+        list[tuple[float, int]]: (upper bound %, entry position) per candidate
+    """
+
+    shared_chars: dict[int, int] = {}
+    for char, count in histogram.items():
+        for position, mod_count in mod_index.char_postings.get(char, ()):
+            shared_chars[position] = shared_chars.get(position, 0) + min(
+                count, mod_count
+            )
+
+    candidates: list[tuple[float, int]] = []
+    for position, shared in shared_chars.items():
+        total: int = length + mod_index.entries[position].length
+        bound: float = round(number=200 * shared / total, ndigits=2)
+        if bound >= floor:
+            candidates.append((bound, position))
+
+    return candidates
+
+
+def exact_similarity(name: str, mod: ModName) -> float:
+    """
+    Exact similarity % using the mod's preloaded SequenceMatcher
+
+    Args:
+        name (str): Cleaned name
+        mod (ModName): Mod name with precomputed features
+
+    Returns:
+        float: % Similarity of name and mod name
+    """
+
+    mod.matcher.set_seq1(name)
+    return round(number=mod.matcher.ratio() * 100, ndigits=2)
+
+
+def get_highest_similarity(
+    names: list[tuple[str, str]],
+    mod_index: ModNameIndex,
+    floor: float = KICK_THRESHOLD,
+    stop_at: float = BAN_THRESHOLD,
+) -> tuple[float, str, str]:
+    """
+    Compares a set of names against the candidate mods from the index
+
+    Pairs that cannot reach floor or beat the current best are skipped, so the
+    result is exact whenever it is at least floor (lower scores are reported as
+    0). Ties keep the first pair in mod order, then name order, like the
+    original loop.
+
+    Args:
+        names (list[tuple[str, str]]): (label, cleaned name) pairs to check
+        mod_index (ModNameIndex): Mod name index of the guild
+        floor (float, optional): Lowest % worth scoring. Defaults to KICK_THRESHOLD.
+        stop_at (float, optional): Stop once a % reaches this. Defaults to BAN_THRESHOLD.
+
+    Returns:
+        tuple[float, str, str]: Highest similarity %, name, mod name
+    """
+
+    unique_names: dict[str, int] = {}
+    for name_order, (_, name) in enumerate(names):
+        unique_names.setdefault(name, name_order)
+
+    # (bound, mod position, name order) for every pair that could reach floor
+    pairs: list[tuple[float, int, int]] = []
+    for name, name_order in unique_names.items():
+        for bound, position in get_candidate_bounds(
+            histogram=Counter(name), length=len(name), mod_index=mod_index, floor=floor
+        ):
+            pairs.append((bound, position, name_order))
+
+    # best bound first, then the original mod/name order for ties
+    pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+
+    highest_similarity: float = 0.00
+    highest_key: tuple[int, int] | None = None
+
+    for bound, position, name_order in pairs:
+        if bound < highest_similarity or highest_similarity >= stop_at:
+            break
+
+        label, name = names[name_order]
+        mod: ModName = mod_index.entries[position]
+        similarity: float = exact_similarity(name=name, mod=mod)
+        logger.info(f"{similarity}% {name} ({label}) vs {mod.name}")
+
+        is_better: bool = similarity > highest_similarity or (
+            similarity == highest_similarity
+            and highest_key is not None
+            and (position, name_order) < highest_key
+        )
+        if similarity >= floor and (highest_key is None or is_better):
+            highest_similarity = similarity
+            highest_key = (position, name_order)
+
+    if highest_key is None:
+        return 0.00, "", ""
+
+    position, name_order = highest_key
+    return highest_similarity, names[name_order][1], mod_index.entries[position].name
+
+
+def score_name_matrix(
+    names: list[str],
+    mod_index: ModNameIndex,
+    floor: float = KICK_THRESHOLD,
+    stop_at: float = BAN_THRESHOLD,
+    max_cells: int = 2_000_000,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Scores many cleaned names against every mod name
+
+    Length and character-multiset bounds are computed for all pairs as
+    NumPy matrices (in chunks of at most max_cells histogram cells). Only the
+    pairs whose bound reaches floor get an exact score, best bound first, so a
+    best score of at least floor is exact and picks the first mod on ties, like
+    get_highest_similarity. Lower scores are reported as 0.
+
+    Args:
+        names (list[str]): Cleaned names
+        mod_index (ModNameIndex): Mod name index of the guild
+        floor (float, optional): Lowest % worth scoring. Defaults to KICK_THRESHOLD.
+        stop_at (float, optional): Stop a name once a % reaches this.
+            Defaults to BAN_THRESHOLD.
+        max_cells (int, optional): Max histogram cells per chunk.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Best similarity % per name, index of the
+        best mod in mod_index.entries per name (-1 if none reached floor)
+    """
+
+    mods: tuple[ModName, ...] = mod_index.entries
+    best_scores: np.ndarray = np.zeros(len(names), dtype=np.float64)
+    best_mods: np.ndarray = np.full(len(names), -1, dtype=np.int64)
+
+    if not names or not mods:
+        return best_scores, best_mods
+
+    vocabulary: dict[str, int] = {}
+    for mod in mods:
+        for char in mod.histogram:
+            vocabulary.setdefault(char, len(vocabulary))
+
+    mod_histograms: np.ndarray = np.zeros((len(mods), len(vocabulary)), dtype=np.int32)
+    for row, mod in enumerate(mods):
+        for char, count in mod.histogram.items():
+            mod_histograms[row, vocabulary[char]] = count
+
+    mod_lengths: np.ndarray = np.array([mod.length for mod in mods], dtype=np.int32)
+    chunk_size: int = max(1, max_cells // (len(mods) * len(vocabulary)))
+
+    for start in range(0, len(names), chunk_size):
+        chunk: list[str] = names[start : start + chunk_size]
+        bounds: np.ndarray = chunk_upper_bounds(
+            names=chunk,
+            vocabulary=vocabulary,
+            mod_histograms=mod_histograms,
+            mod_lengths=mod_lengths,
+        )
+
+        for offset, name in enumerate(chunk):
+            row: int = start + offset
+            candidates: np.ndarray = np.flatnonzero(
+                bounds[offset] >= floor - BOUND_MARGIN
+            )
+            if candidates.size == 0:
+                continue
+
+            # best bound first, mod order on equal bounds
+            order = candidates[np.argsort(-bounds[offset][candidates], kind="stable")]
+            for mod_position in order:
+                bound: float = float(bounds[offset][mod_position])
+                if best_scores[row] >= stop_at:
+                    break
+
+                if bound < best_scores[row] - BOUND_MARGIN:
+                    break
+
+                score: float = exact_similarity(name=name, mod=mods[mod_position])
+                is_better: bool = score > best_scores[row] or (
+                    score == best_scores[row] and mod_position < best_mods[row]
+                )
+                if score >= floor and is_better:
+                    best_scores[row] = score
+                    best_mods[row] = mod_position
+
+    return best_scores, best_mods
+
+
+def chunk_upper_bounds(
+    names: list[str],
+    vocabulary: dict[str, int],
+    mod_histograms: np.ndarray,
+    mod_lengths: np.ndarray,
+) -> np.ndarray:
+    """
+    Upper bound of the similarity % of every (name, mod) pair
+
+    Args:
+        names (list[str]): Cleaned names
+        vocabulary (dict[str, int]): Character -> histogram column of the mods
+        mod_histograms (np.ndarray): Mods x characters count matrix
+        mod_lengths (np.ndarray): Length of each mod name
+
+    Returns:
+        np.ndarray: Names x mods matrix of upper bounds (not rounded)
+    """
+
+    name_histograms: np.ndarray = np.zeros(
+        (len(names), len(vocabulary)), dtype=np.int32
+    )
+    for row, name in enumerate(names):
+        for char, count in Counter(name).items():
+            column: int | None = vocabulary.get(char)
+            if column is not None:
+                name_histograms[row, column] = count
+
+    name_lengths: np.ndarray = np.array([len(name) for name in names], dtype=np.int32)
+
+    shared_chars: np.ndarray = np.minimum(
+        name_histograms[:, None, :], mod_histograms[None, :, :]
+    ).sum(axis=2)
+    totals: np.ndarray = name_lengths[:, None] + mod_lengths[None, :]
+
+    return 200 * shared_chars / totals
@@ -30,3 +30,35 @@ MAPPING: dict[str, str] = {
     "ジ": "",
     " ": "",
 }
+
+# similarity % thresholds
+BAN_THRESHOLD: float = 87.00
+KICK_THRESHOLD: float = 70.00
+
+# max cached clean_username results
+CLEAN_USERNAME_CACHE_SIZE: int = 4096
+
+# join-raid mode
+RAID_JOIN_THRESHOLD: int = 15  # joins within RAID_WINDOW_SECONDS that start a raid
+RAID_EXIT_THRESHOLD: int = 5  # joins within RAID_WINDOW_SECONDS that end it
+RAID_WINDOW_SECONDS: float = 10.0
+RAID_BATCH_SECONDS: float = 2.0
+RAID_BATCH_SIZE: int = 50
+
+# full-guild sweeps
+SWEEP_CHUNK_SIZE: int = 500
+SWEEP_PROGRESS_SECONDS: float = 30.0
+
+# cached pass verdicts of name checks
+VERDICT_CACHE_SECONDS: float = 3600.0
+VERDICT_CACHE_SIZE: int = 100_000
+
+# guilds checked at once when a user changes their global name
+USER_UPDATE_GUILD_CONCURRENCY: int = 5
+
+# pooled invites sent to kicked imposters
+INVITE_MAX_AGE: int = 600
+INVITE_MAX_USES: int = 5
+INVITE_MIN_LIFETIME: float = 120.0  # never hand out an invite closer to expiry
+INVITE_ROTATE_SECONDS: float = 240.0  # pre-create the next invite this close to expiry
+INVITE_ROTATE_USES: int = 1  # ...or with this many hand-outs left
@@ -0,0 +1,249 @@
+"""
+Central executor for Discord moderation actions.
+
+Handlers submit actions (ban, kick, delete, role, DM, log) and return right
+away. Each guild has a priority queue drained by at most
+EXECUTOR_GUILD_CONCURRENCY workers. A route that hits a rate limit (429) or a
+server error is paused for its retry-after/backoff and the action goes back in
+the queue until then (up to EXECUTOR_MAX_RETRIES times), so the guild's other
+routes keep running meanwhile.
+"""
+
+# imports
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from config import logger
+from services.shared.vars import (
+    EXECUTOR_BACKOFF_SECONDS,
+    EXECUTOR_GUILD_CONCURRENCY,
+    EXECUTOR_MAX_RETRIES,
+)
+
+Action = Callable[[], Awaitable[Any]]
+
+
+@dataclass(order=True)
+class QueuedAction:
+    """
+    An action waiting in a guild's queue
+    """
+
+    priority: int
+    sequence: int
+    route: str = field(compare=False)
+    run: Action = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    not_before: float = field(compare=False, default=0.0)
+    attempts: int = field(compare=False, default=0)
+
+
+@dataclass
+class ExecutorStats:
+    """
+    Counters of executed actions
+    """
+
+    completed: int = 0
+    failed: int = 0
+    retried: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+
+action_queues: dict[int, list[QueuedAction]] = {}
+guild_workers: dict[int, set[asyncio.Task]] = {}
+guild_wakeups: dict[int, asyncio.Event] = {}
+route_paused_until: dict[str, float] = {}
+action_sequence = itertools.count()
+executor_stats = ExecutorStats()
+
+
+# entry functions
+def submit(guild_id: int, priority: int, route: str, action: Action) -> asyncio.Future:
+    """
+    Queues an action for a guild
+
+    Args:
+        guild_id (int): ID of the guild the action is for
+        priority (int): ACTION_PRIORITY_* (lower goes first)
+        route (str): Rate-limit route of the action, e.g. "kick:<guild id>"
+        action (Action): Makes the API call (called again on retry)
+
+    Returns:
+        asyncio.Future: Resolves to True when the action succeeded, else False
+    """
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    heapq.heappush(
+        action_queues.setdefault(guild_id, []),
+        QueuedAction(
+            priority=priority,
+            sequence=next(action_sequence),
+            route=route,
+            run=action,
+            future=future,
+            enqueued_at=time.monotonic(),
+        ),
+    )
+
+    guild_wakeups.setdefault(guild_id, asyncio.Event()).set()
+
+    workers: set[asyncio.Task] = guild_workers.setdefault(guild_id, set())
+    if len(workers) < EXECUTOR_GUILD_CONCURRENCY:
+        workers.add(asyncio.create_task(run_worker(guild_id=guild_id)))
+
+    return future
+
+
+def get_executor_stats() -> dict[str, float]:
+    """
+    Gets the executor's queue depth and latency
+
+    Returns:
+        dict[str, float]: Queue depth, completed/failed/retried counts,
+        average and max latency (seconds from submit to done)
+    """
+
+    finished: int = executor_stats.completed + executor_stats.failed
+
+    return {
+        "queue_depth": sum(len(queue) for queue in action_queues.values()),
+        "completed": executor_stats.completed,
+        "failed": executor_stats.failed,
+        "retried": executor_stats.retried,
+        "avg_latency": executor_stats.total_latency / finished if finished else 0.0,
+        "max_latency": executor_stats.max_latency,
+    }
+
+
+# helper functions
+async def run_worker(guild_id: int) -> None:
+    """
+    Runs a guild's queued actions by priority until the queue is empty, waiting
+    only when every queued action is on a paused route
+
+    Args:
+        guild_id (int): ID of the guild
+    """
+
+    queue: list[QueuedAction] = action_queues[guild_id]
+    wakeup: asyncio.Event = guild_wakeups.setdefault(guild_id, asyncio.Event())
+
+    try:
+        while queue:
+            queued_action, ready_at = pop_ready(queue=queue, now=time.monotonic())
+
+            if queued_action is None:
+                # woken early when a new action is submitted; asyncio.wait,
+                # unlike wait_for, never swallows a cancellation
+                wakeup.clear()
+                waiter: asyncio.Task = asyncio.create_task(wakeup.wait())
+                try:
+                    await asyncio.wait({waiter}, timeout=ready_at - time.monotonic())
+                finally:
+                    waiter.cancel()
+
+                continue
+
+            await execute(queue=queue, queued_action=queued_action)
+
+    finally:
+        guild_workers[guild_id].discard(asyncio.current_task())  # type: ignore
+        if not queue and not guild_workers[guild_id]:
+            del action_queues[guild_id]
+            del guild_workers[guild_id]
+            guild_wakeups.pop(guild_id, None)
+
+
+def pop_ready(
+    queue: list[QueuedAction], now: float
+) -> tuple[QueuedAction | None, float]:
+    """
+    Pops the first action by priority that is not waiting on a paused route,
+    the waiting ones it passes over stay queued
+
+    Args:
+        queue (list[QueuedAction]): The guild's queue
+        now (float): time.monotonic()
+
+    Returns:
+        tuple[QueuedAction | None, float]:
+        The action (None if every action is waiting),
+        When the first waiting action can run
+    """
+
+    waiting: list[QueuedAction] = []
+    ready_at: float = math.inf
+    ready_action: QueuedAction | None = None
+
+    while queue:
+        queued_action: QueuedAction = heapq.heappop(queue)
+        not_before: float = max(
+            queued_action.not_before, route_paused_until.get(queued_action.route, 0)
+        )
+
+        if not_before <= now:
+            ready_action = queued_action
+            break
+
+        waiting.append(queued_action)
+        ready_at = min(ready_at, not_before)
+
+    for queued_action in waiting:
+        heapq.heappush(queue, queued_action)
+
+    return ready_action, ready_at
+
+
+async def execute(queue: list[QueuedAction], queued_action: QueuedAction) -> None:
+    """
+    Runs an action; on a rate limit or server error its route is paused and the
+    action requeued to run again after the retry-after/backoff
+
+    Args:
+        queue (list[QueuedAction]): The guild's queue
+        queued_action (QueuedAction): The action
+    """
+
+    succeeded: bool = False
+
+    try:
+        await queued_action.run()
+        succeeded = True
+
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        status: int | None = getattr(e, "status", None)
+        retryable: bool = status is not None and (status == 429 or status >= 500)
+
+        if retryable and queued_action.attempts < EXECUTOR_MAX_RETRIES:
+            retry_after: float = getattr(e, "retry_after", None) or (
+                EXECUTOR_BACKOFF_SECONDS * 2**queued_action.attempts
+            )
+            queued_action.attempts += 1
+            queued_action.not_before = time.monotonic() + retry_after
+            route_paused_until[queued_action.route] = queued_action.not_before
+            executor_stats.retried += 1
+
+            heapq.heappush(queue, queued_action)
+            return
+
+        logger.error(f"• ACTION FAILED {queued_action.route}: {e}")
+
+    latency: float = time.monotonic() - queued_action.enqueued_at
+    executor_stats.total_latency += latency
+    executor_stats.max_latency = max(executor_stats.max_latency, latency)
+
+    if succeeded:
+        executor_stats.completed += 1
+    else:
+        executor_stats.failed += 1
+
+    if not queued_action.future.done():
+        queued_action.future.set_result(succeeded)
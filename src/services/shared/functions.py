@@ -3,17 +3,37 @@ Shared services for the app
 """
 
 # imports
+import unicodedata
 from typing import Any
 
-import config
+import services.shared.gateway as gateway
+import services.shared.log_dispatcher as log_dispatcher
+import services.shared.member_index as member_index
+import services.shared.roster as roster
 from config import logger
-from services.shared.vars import NA_MOD_NAMES_LIST
+from services.shared.vars import (
+    COMBINING_MARK_RANGES,
+    CONFUSABLES,
+    LOG_PRIORITY_INFO,
+)
+
+# confusables + combining marks, built once for str.translate
+SKELETON_TABLE: dict[int, str | None] = {
+    **{
+        code_point: None
+        for start, end in COMBINING_MARK_RANGES
+        for code_point in range(start, end + 1)
+        if unicodedata.combining(chr(code_point))
+    },
+    **{ord(char): value or None for char, value in CONFUSABLES.items()},
+}
 
 
 @logger.catch
 async def log_in(bot, discord) -> None:
     """
-    Log & Update bot status/command tree
+    Log & Update command tree (the status is set at connect, see
+    gateway.get_bot_options)
 
     Args:
         bot (_type_): Bot object
@@ -22,97 +42,87 @@ async def log_in(bot, discord) -> None:
 
     logger.info(f"Logged in as {bot.user.name}")
 
-    await bot.change_presence(
-        status=discord.Status.online,
-        activity=discord.CustomActivity(name="👮🏻‍♂️ Protecting the Gains"),
-    )
     await bot.tree.sync()
 
 
-async def get_mod_info(bot, guild_id: int) -> tuple[list[str], list[int]] | None:
+async def get_mod_info(bot, guild_id: int) -> tuple[list[str], set[int]] | None:
     """
-    Fetches moderators and server owner
+    Fetches moderators and server owner from the guild's cached roster
 
     Args:
         bot (_type_): Discord object
         guild_id (int): ID of server for fetching info
 
     Returns:
-        tuple[list[str], list[int]] | None: List of moderator names and list of IDs
+        tuple[list[str], set[int]] | None: List of moderator names and set of IDs
     """
 
-    mod_names: list[str] = []
-    mod_ids: list[int] = []
-
     guild = bot.get_guild(guild_id)
     if guild is None:
         logger.critical(f"get_mod_info > unable to find guild with ID: {guild_id}")
-        return mod_names, mod_ids
-
-    for member in guild.members:
-        role_names = [role.name for role in member.roles]
-        if config.MOD_ROLE_NAME in role_names:
-            mod_ids.append(member.id)
-
-            member_name: str = str(object=member.name).lower().replace(" ", "")
-            member_nick: str = str(object=member.nick).lower().replace(" ", "")
-
-            if member_name and member_name != "none" and member_name not in mod_names:
-                mod_names.append(member_name)
+        return [], set()
 
-            if member_nick and member_nick != "none" and member_nick not in mod_names:
-                mod_names.append(member_nick)
+    if roster.get_roster_version(guild_id=guild.id) is None:
+        await gateway.ensure_mods_cached(guild=guild)
 
-    owner_name: str = str(object=guild.owner.name).lower().replace(" ", "")
-    owner_nick: str = str(object=guild.owner.nick).lower().replace(" ", "")
+    return roster.get_roster_info(guild=guild)
 
-    if owner_name and owner_name != "none" and owner_name not in mod_names:
-        mod_ids.append(guild.owner_id)
-        mod_names.append(owner_name)
 
-    if owner_nick and owner_nick != "none" and owner_nick not in mod_names:
-        mod_names.append(owner_nick)
-
-    mod_names.extend(NA_MOD_NAMES_LIST)
-
-    return mod_names, mod_ids
-
-
-async def user_obj_to_member_obj(
-    bot, user_object
-) -> tuple[Any, Any] | tuple[None, None]:
+async def user_obj_to_member_objs(bot, user_object) -> list[tuple[Any, Any]]:
     """
-    Takes a discord user object and transforms it to a guild member object
+    Takes a discord user object and finds its member object in every shared guild
 
     Args:
         bot (_type_): Discord bot object
         user_object (_type_): User object
 
     Returns:
-        tuple[Any, Any] | tuple[None, None]: Guild member object, guild object
+        list[tuple[Any, Any]]: (Guild member object, guild object) per guild
     """
 
-    for guild in bot.guilds:
-        member = guild.get_member(user_object.id)
-        if member:
-            return member, guild
+    members: list[tuple[Any, Any]] = []
+
+    for guild_id in member_index.get_guild_ids(bot=bot, user_id=user_object.id):
+        guild = bot.get_guild(guild_id)
+        member = guild.get_member(user_object.id) if guild is not None else None
+        if member is not None:
+            members.append((member, guild))
 
-    return None, None
+    return members
 
 
-async def log_event(discord, member, result_msg: str) -> None:
+async def log_event(
+    discord, member, result_msg: str, priority: int = LOG_PRIORITY_INFO
+) -> None:
     """
-    Send log messages to the define mod-log channel
+    Queue log messages for the define mod-log channel (sent as batched digests)
 
     Args:
         discord (_type_): Discord object
         member (_type_): Member object
         result_msg (str): Log Message
+        priority (int, optional): LOG_PRIORITY_ACTION for bans/kicks/spam.
+            Defaults to LOG_PRIORITY_INFO.
     """
 
-    log_channel = discord.utils.get(
-        member.guild.channels, name=config.MOD_LOG_CHANNEL_NAME
+    log_dispatcher.queue_log_event(
+        guild=member.guild, result_msg=result_msg, priority=priority
     )
 
-    if log_channel is not None:
-        await log_channel.send(result_msg)
+
+def skeleton(text: str) -> str:
+    """
+    Maps look-alike characters (styled math letters, fullwidth, cyrillic/greek
+    homoglyphs, accents, invisible chars) to plain ascii. Case is kept.
+
+    Args:
+        text (str): Text to normalize
+
+    Returns:
+        str: The normalized text (the same string if it is already ascii)
+    """
+
+    if text.isascii():
+        return text
+
+    return unicodedata.normalize("NFKD", text).translate(SKELETON_TABLE)
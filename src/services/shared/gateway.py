@@ -0,0 +1,181 @@
+"""
+Gateway options of the bot.
+
+By default the bot asks for every intent and caches everything. With
+LEAN_GATEWAY it only asks for what the services use (guilds, members, guild
+messages with content, reactions), skips presences and voice states, keeps a
+MESSAGE_CACHE_SIZE message cache and does not chunk guilds at startup. To
+build a guild's mod roster, its member list is paged through over REST without
+keeping it and only the mods and owner are cached. A guild is only chunked when
+a service really needs every member (a /sweep).
+
+With SHARDING (or SHARD_COUNT/SHARD_IDS for a shard range per process) the bot
+is an AutoShardedBot.
+"""
+
+# imports
+import asyncio
+from typing import Any
+
+import config
+import services.shared.member_index as member_index
+import services.shared.roster as roster
+from config import logger
+from services.shared.vars import QUERY_MEMBERS_MAX_IDS
+
+chunk_locks: dict[int, asyncio.Lock] = {}
+
+
+# entry functions
+def is_shard_config_valid() -> bool:
+    """
+    Checks the shard settings before the bot is built (AutoShardedBot only
+    fails on them once it is constructed)
+
+    Returns:
+        bool: The settings are usable, a critical error is logged if not
+    """
+
+    if config.SHARD_IDS is None:
+        return True
+
+    if config.SHARD_COUNT is None:
+        logger.critical("SHARD_IDS is set, so SHARD_COUNT must be set too.")
+        return False
+
+    if any(not 0 <= shard_id < config.SHARD_COUNT for shard_id in config.SHARD_IDS):
+        logger.critical(
+            f"SHARD_IDS {config.SHARD_IDS} must be between 0 and "
+            f"SHARD_COUNT - 1 ({config.SHARD_COUNT - 1})."
+        )
+        return False
+
+    return True
+
+
+def get_bot_class(commands) -> Any:
+    """
+    Gets the bot class, AutoShardedBot when sharding is configured
+
+    Args:
+        commands (_type_): discord.ext.commands module
+
+    Returns:
+        Any: commands.Bot or commands.AutoShardedBot
+    """
+
+    return commands.AutoShardedBot if is_sharded() else commands.Bot
+
+
+def get_bot_options(discord) -> dict[str, Any]:
+    """
+    Gets the gateway keyword arguments for the bot
+
+    Args:
+        discord (_type_): Discord object
+
+    Returns:
+        dict[str, Any]: intents, presence, the lean mode caches and the shard
+        range of this process
+    """
+
+    # set at IDENTIFY so every shard starts with it
+    options: dict[str, Any] = {
+        "status": discord.Status.online,
+        "activity": discord.CustomActivity(name="👮🏻‍♂️ Protecting the Gains"),
+    }
+
+    if config.SHARD_COUNT is not None:
+        options["shard_count"] = config.SHARD_COUNT
+    if config.SHARD_IDS is not None:
+        options["shard_ids"] = config.SHARD_IDS
+
+    if not config.LEAN_GATEWAY:
+        return {**options, "intents": discord.Intents.all()}
+
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.members = True
+    intents.guild_messages = True
+    intents.message_content = True
+    intents.guild_reactions = True
+
+    return {
+        **options,
+        "intents": intents,
+        "member_cache_flags": discord.MemberCacheFlags(voice=False, joined=True),
+        "max_messages": config.MESSAGE_CACHE_SIZE,
+        "chunk_guilds_at_startup": False,
+    }
+
+
+async def ensure_mods_cached(guild) -> None:
+    """
+    Caches a guild's mods and owner without chunking it, then rebuilds its
+    roster (no-op for chunked guilds)
+
+    Args:
+        guild (_type_): Guild object
+    """
+
+    if guild.chunked:
+        return
+
+    async with chunk_locks.setdefault(guild.id, asyncio.Lock()):
+        # built while waiting for the lock
+        if guild.chunked or roster.get_roster_version(guild_id=guild.id) is not None:
+            return
+
+        logger.info(f"• CACHING MODS: {guild.name}")
+
+        # the fetched members are only checked for the mod role, never cached
+        mod_ids: list[int] = [guild.owner_id]
+        async for member in guild.fetch_members(limit=None):
+            if roster.is_mod(member=member) and member.id != guild.owner_id:
+                mod_ids.append(member.id)
+
+        for start in range(0, len(mod_ids), QUERY_MEMBERS_MAX_IDS):
+            await guild.query_members(
+                user_ids=mod_ids[start : start + QUERY_MEMBERS_MAX_IDS], cache=True
+            )
+
+        roster.invalidate_roster(guild_id=guild.id)
+
+
+async def ensure_chunked(guild) -> None:
+    """
+    Requests a guild's full member list once, then re-indexes its members and
+    rebuilds its roster (no-op for guilds chunked at startup)
+
+    Args:
+        guild (_type_): Guild object
+    """
+
+    if guild.chunked:
+        return
+
+    async with chunk_locks.setdefault(guild.id, asyncio.Lock()):
+        if guild.chunked:
+            return
+
+        logger.info(f"• CHUNKING GUILD: {guild.name}")
+        await guild.chunk(cache=True)
+
+        member_index.index_guild(guild=guild)
+        roster.invalidate_roster(guild_id=guild.id)
+
+
+# helper functions
+def is_sharded() -> bool:
+    """
+    Checks if the bot runs as AutoShardedBot
+
+    Returns:
+        bool: SHARDING, SHARD_COUNT or SHARD_IDS is set
+    """
+
+    return (
+        config.SHARDING
+        or config.SHARD_COUNT is not None
+        or config.SHARD_IDS is not None
+    )
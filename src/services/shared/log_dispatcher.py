@@ -0,0 +1,162 @@
+"""
+Batched delivery of mod-log messages.
+
+Log lines are queued per guild and sent as combined digest messages by one
+background task, so moderation handlers never wait on the mod-log channel.
+Ban/kick lines wake the task right away and go before pass lines; pass lines
+are sent on a time/size window and dropped first when a raid floods the queue.
+Digests go out through the action executor at the lowest priority.
+"""
+
+# imports
+import asyncio
+import functools
+from dataclasses import dataclass, field
+
+import config
+import services.shared.executor as executor
+import services.shared.resolver as resolver
+from services.shared.vars import (
+    ACTION_PRIORITY_LOG,
+    DISCORD_MESSAGE_LIMIT,
+    LOG_DIGEST_MAX_LINES,
+    LOG_FLUSH_SECONDS,
+    LOG_MAX_PENDING,
+    LOG_PRIORITY_ACTION,
+)
+
+
+@dataclass
+class PendingLogs:
+    """
+    Log lines waiting to be sent for a guild
+    """
+
+    guild: object
+    actions: list[str] = field(default_factory=list)
+    infos: list[str] = field(default_factory=list)
+    dropped: int = 0
+
+
+pending_logs: dict[int, PendingLogs] = {}
+flush_requested: asyncio.Event | None = None
+log_worker: asyncio.Task | None = None
+
+
+# entry functions
+def queue_log_event(guild, result_msg: str, priority: int) -> None:
+    """
+    Queues a log line for the guild's mod-log channel
+
+    Args:
+        guild (_type_): Guild object
+        result_msg (str): Log Message
+        priority (int): LOG_PRIORITY_ACTION or LOG_PRIORITY_INFO
+    """
+
+    pending: PendingLogs = pending_logs.setdefault(guild.id, PendingLogs(guild=guild))
+    pending.guild = guild
+
+    if priority == LOG_PRIORITY_ACTION:
+        pending.actions.append(result_msg)
+
+    elif len(pending.actions) + len(pending.infos) < LOG_MAX_PENDING:
+        pending.infos.append(result_msg)
+
+    else:
+        pending.dropped += 1
+
+    ensure_log_worker()
+
+    if priority == LOG_PRIORITY_ACTION or len(pending.infos) >= LOG_DIGEST_MAX_LINES:
+        flush_requested.set()  # type: ignore
+
+
+async def flush_logs() -> None:
+    """
+    Sends every queued log line as digest messages
+    """
+
+    for guild_id in list(pending_logs):
+        pending: PendingLogs = pending_logs.pop(guild_id)
+        lines: list[str] = pending.actions + pending.infos
+        if pending.dropped:
+            lines.append(f"… {pending.dropped} more log entries dropped")
+
+        log_channel = resolver.get_channel(
+            guild=pending.guild, name=config.MOD_LOG_CHANNEL_NAME
+        )
+        if log_channel is None:
+            continue
+
+        for digest in build_digests(lines=lines):
+            executor.submit(
+                guild_id=guild_id,
+                priority=ACTION_PRIORITY_LOG,
+                route=f"send:{log_channel.id}",
+                action=functools.partial(log_channel.send, digest),
+            )
+
+
+# helper functions
+def ensure_log_worker() -> None:
+    """
+    Starts the digest worker if it is not running
+    """
+
+    global flush_requested, log_worker  # pylint: disable=global-statement
+
+    if flush_requested is None:
+        flush_requested = asyncio.Event()
+
+    if log_worker is None or log_worker.done():
+        log_worker = asyncio.create_task(run_log_worker())
+
+
+async def run_log_worker() -> None:
+    """
+    Flushes queued log lines every LOG_FLUSH_SECONDS, or sooner when asked
+    """
+
+    while True:
+        # asyncio.wait, unlike wait_for, never swallows a cancellation
+        waiter: asyncio.Task = asyncio.create_task(flush_requested.wait())  # type: ignore
+        try:
+            await asyncio.wait({waiter}, timeout=LOG_FLUSH_SECONDS)
+        finally:
+            waiter.cancel()
+
+        flush_requested.clear()  # type: ignore
+        if pending_logs:
+            await flush_logs()
+
+
+def build_digests(lines: list[str]) -> list[str]:
+    """
+    Combines log lines into as few messages as Discord allows
+
+    Args:
+        lines (list[str]): Log lines in send order
+
+    Returns:
+        list[str]: Digest messages
+    """
+
+    digests: list[str] = []
+    current: list[str] = []
+    current_length: int = 0
+
+    for line in lines:
+        line = line[:DISCORD_MESSAGE_LIMIT]
+        too_long: bool = current_length + len(line) + 1 > DISCORD_MESSAGE_LIMIT
+        if current and (too_long or len(current) >= LOG_DIGEST_MAX_LINES):
+            digests.append("\n".join(current))
+            current, current_length = [], 0
+
+        current.append(line)
+        current_length += len(line) + 1
+
+    if current:
+        digests.append("\n".join(current))
+
+    return digests
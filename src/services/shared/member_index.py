@@ -0,0 +1,98 @@
+"""
+Index of user ID -> IDs of the guilds the user is a member of.
+
+Built with one scan per guild when the bot is ready and kept current from
+member join/remove and guild join/remove events.
+"""
+
+user_guilds: dict[int, set[int]] = {}
+indexed_guilds: set[int] = set()
+
+
+def index_guild(guild) -> None:
+    """
+    Adds every member of a guild to the index
+
+    Args:
+        guild (_type_): Guild object
+    """
+
+    for member in guild.members:
+        user_guilds.setdefault(member.id, set()).add(guild.id)
+
+    indexed_guilds.add(guild.id)
+
+
+def remove_guild(guild) -> None:
+    """
+    Drops a guild the bot left from the index
+
+    Args:
+        guild (_type_): Guild object
+    """
+
+    indexed_guilds.discard(guild.id)
+
+    for member in guild.members:
+        remove_user_guild(user_id=member.id, guild_id=guild.id)
+
+
+def member_added(member) -> None:
+    """
+    Adds a member that joined a guild
+
+    Args:
+        member (_type_): Member object
+    """
+
+    user_guilds.setdefault(member.id, set()).add(member.guild.id)
+
+
+def member_removed(member) -> None:
+    """
+    Removes a member that left a guild
+
+    Args:
+        member (_type_): Member object
+    """
+
+    remove_user_guild(user_id=member.id, guild_id=member.guild.id)
+
+
+def get_guild_ids(bot, user_id: int) -> set[int]:
+    """
+    Gets the IDs of the guilds a user is in
+
+    Args:
+        bot (_type_): Discord bot object
+        user_id (int): ID of the user
+
+    Returns:
+        set[int]: Guild IDs (guilds not indexed yet are checked directly)
+    """
+
+    guild_ids: set[int] = set(user_guilds.get(user_id, ()))
+
+    for guild in bot.guilds:
+        if guild.id not in indexed_guilds and guild.get_member(user_id) is not None:
+            guild_ids.add(guild.id)
+
+    return guild_ids
+
+
+def remove_user_guild(user_id: int, guild_id: int) -> None:
+    """
+    Removes one guild from a user's entry
+
+    Args:
+        user_id (int): ID of the user
+        guild_id (int): ID of the guild
+    """
+
+    guild_ids: set[int] | None = user_guilds.get(user_id)
+    if guild_ids is None:
+        return
+
+    guild_ids.discard(guild_id)
+    if not guild_ids:
+        del user_guilds[user_id]
@@ -0,0 +1,74 @@
+"""
+Periodic metrics log.
+
+Every METRICS_LOG_SECONDS the stats of each shard of this process (guilds,
+latency, readiness and route timings) are written to the log, followed by the
+stats of every source services registered with add_stats_source.
+"""
+
+# imports
+import asyncio
+from typing import Any, Callable
+
+import services.shared.shards as shards
+from config import logger
+from services.shared.vars import METRICS_LOG_SECONDS
+
+stats_sources: dict[str, Callable[[], dict[str, Any]]] = {}
+metrics_task: asyncio.Task | None = None
+
+
+# entry functions
+def add_stats_source(name: str, get_stats: Callable[[], dict[str, Any]]) -> None:
+    """
+    Registers a service's stats for the metrics log
+
+    Args:
+        name (str): Name shown in the log
+        get_stats (Callable[[], dict[str, Any]]): Gets the service's stats
+    """
+
+    stats_sources[name] = get_stats
+
+
+def start_metrics_log(bot) -> None:
+    """
+    Starts the background task that logs the metrics
+
+    Args:
+        bot (_type_): Discord bot object
+    """
+
+    global metrics_task  # pylint: disable=global-statement
+
+    if metrics_task is None or metrics_task.done():
+        metrics_task = asyncio.create_task(run_metrics_log(bot=bot))
+
+
+# helper functions
+async def run_metrics_log(bot) -> None:
+    """
+    Logs the metrics every METRICS_LOG_SECONDS
+
+    Args:
+        bot (_type_): Discord bot object
+    """
+
+    while True:
+        await asyncio.sleep(METRICS_LOG_SECONDS)
+        logger.catch(log_metrics)(bot=bot)
+
+
+def log_metrics(bot) -> None:
+    """
+    Writes the stats of every shard and registered source to the log
+
+    Args:
+        bot (_type_): Discord bot object
+    """
+
+    for shard_id, shard_stats in shards.get_shard_stats(bot=bot).items():
+        logger.info(f"• SHARD {shard_id} STATS: {shard_stats}")
+
+    for name, get_stats in stats_sources.items():
+        logger.info(f"• {name.upper()} STATS: {get_stats()}")
@@ -0,0 +1,104 @@
+"""
+Resolves configured channel/role names to IDs once per guild.
+
+Lookups after the first go through guild.get_channel/get_role, which are dict
+lookups. A guild's entries are dropped on channel/role create, update and
+delete events and resolved again on next use.
+"""
+
+# imports
+from typing import Any
+
+resolved_ids: dict[int, dict[tuple[str, str], int | None]] = {}
+
+
+# entry functions
+def get_channel(guild, name: str | None) -> Any | None:
+    """
+    Gets a guild channel by name
+
+    Args:
+        guild (_type_): Guild object
+        name (str | None): Channel name
+
+    Returns:
+        Any | None: Discord channel object
+    """
+
+    channel_id: int | None = get_channel_id(guild=guild, name=name)
+    return guild.get_channel(channel_id) if channel_id is not None else None
+
+
+def get_channel_id(guild, name: str | None) -> int | None:
+    """
+    Gets the ID of a guild channel by name
+
+    Args:
+        guild (_type_): Guild object
+        name (str | None): Channel name
+
+    Returns:
+        int | None: Channel ID, None if there is no such channel
+    """
+
+    return resolve(guild=guild, kind="channel", name=name)
+
+
+def get_role(guild, name: str | None) -> Any | None:
+    """
+    Gets a guild role by name
+
+    Args:
+        guild (_type_): Guild object
+        name (str | None): Role name
+
+    Returns:
+        Any | None: Discord role object
+    """
+
+    role_id: int | None = resolve(guild=guild, kind="role", name=name)
+    return guild.get_role(role_id) if role_id is not None else None
+
+
+def invalidate(guild_id: int) -> None:
+    """
+    Drops every resolved name of a guild
+
+    Args:
+        guild_id (int): ID of the guild
+    """
+
+    resolved_ids.pop(guild_id, None)
+
+
+# helper functions
+def resolve(guild, kind: str, name: str | None) -> int | None:
+    """
+    Resolves a channel/role name to its ID, scanning the guild only on a miss
+
+    Args:
+        guild (_type_): Guild object
+        kind (str): "channel" or "role"
+        name (str | None): Channel/role name
+
+    Returns:
+        int | None: The ID, None if nothing has that name
+    """
+
+    if name is None or guild is None:
+        return None
+
+    guild_ids: dict[tuple[str, str], int | None] = resolved_ids.setdefault(guild.id, {})
+    key: tuple[str, str] = (kind, name)
+
+    if key in guild_ids:
+        cached_id: int | None = guild_ids[key]
+        lookup = guild.get_channel if kind == "channel" else guild.get_role
+        if cached_id is None or lookup(cached_id) is not None:
+            return cached_id
+
+    objects = guild.channels if kind == "channel" else guild.roles
+    found = next((obj for obj in objects if obj.name == name), None)
+
+    guild_ids[key] = found.id if found is not None else None
+    return guild_ids[key]
@@ -0,0 +1,271 @@
+"""
+Per-guild moderator roster cache.
+
+Built with one member scan the first time a guild is looked up, then kept up to
+date from member, role and guild events so lookups never rescan the guild.
+"""
+
+# imports
+import itertools
+from dataclasses import dataclass, field
+
+import config
+from services.shared.vars import NA_MOD_NAMES_LIST
+
+# every roster change gets a new version, unique across guilds
+roster_versions = itertools.count(start=1)
+
+
+@dataclass
+class ModRoster:
+    """
+    Moderators and owner of a guild
+    """
+
+    version: int
+    mods: dict[int, tuple[str, str]] = field(default_factory=dict)
+    owner_id: int | None = None
+    owner_names: tuple[str, str] = ("", "")
+    mod_names: list[str] | None = None
+    mod_ids: set[int] | None = None
+
+
+rosters: dict[int, ModRoster] = {}
+
+
+# entry functions
+def get_roster(guild) -> ModRoster:
+    """
+    Gets the cached roster of a guild, building it on first use
+
+    Args:
+        guild (_type_): Guild object
+
+    Returns:
+        ModRoster: The guild's moderator roster
+    """
+
+    roster: ModRoster | None = rosters.get(guild.id)
+    if roster is None:
+        roster = build_roster(guild=guild)
+        rosters[guild.id] = roster
+
+    return roster
+
+
+def get_roster_info(guild) -> tuple[list[str], set[int]]:
+    """
+    Gets moderator names and IDs of a guild from its roster
+
+    Args:
+        guild (_type_): Guild object
+
+    Returns:
+        tuple[list[str], set[int]]: List of moderator names and set of IDs
+    """
+
+    roster: ModRoster = get_roster(guild=guild)
+
+    if roster.mod_names is None or roster.mod_ids is None:
+        mod_names: list[str] = []
+        for name in itertools.chain(*roster.mods.values(), roster.owner_names):
+            if name and name not in mod_names:
+                mod_names.append(name)
+        mod_names.extend(NA_MOD_NAMES_LIST)
+
+        mod_ids: set[int] = set(roster.mods)
+        if roster.owner_id is not None:
+            mod_ids.add(roster.owner_id)
+
+        roster.mod_names = mod_names
+        roster.mod_ids = mod_ids
+
+    return roster.mod_names, roster.mod_ids
+
+
+def get_roster_version(guild_id: int) -> int | None:
+    """
+    Gets the current roster version of a guild
+
+    Args:
+        guild_id (int): ID of the guild
+
+    Returns:
+        int | None: Roster version, None if the roster is not built
+    """
+
+    roster: ModRoster | None = rosters.get(guild_id)
+    return roster.version if roster is not None else None
+
+
+def member_updated(before, after) -> None:
+    """
+    Applies a member's role/name changes to the roster
+
+    Args:
+        before (_type_): Member object before the update
+        after (_type_): Member object after the update
+    """
+
+    roster: ModRoster | None = rosters.get(after.guild.id)
+    if roster is None:
+        return
+
+    names: tuple[str, str] = member_names(member=after)
+    changed: bool = False
+
+    if is_mod(member=after):
+        changed = roster.mods.get(after.id) != names
+        roster.mods[after.id] = names
+
+    elif after.id in roster.mods:
+        del roster.mods[after.id]
+        changed = True
+
+    if after.id == roster.owner_id and roster.owner_names != names:
+        roster.owner_names = names
+        changed = True
+
+    if changed:
+        touch_roster(roster=roster)
+
+
+def user_updated(bot, after) -> None:
+    """
+    Applies a user's global name change to every roster they are on
+
+    Args:
+        bot (_type_): Discord bot object
+        after (_type_): User object after the update
+    """
+
+    for guild_id, roster in rosters.items():
+        if after.id not in roster.mods and after.id != roster.owner_id:
+            continue
+
+        guild = bot.get_guild(guild_id)
+        member = guild.get_member(after.id) if guild is not None else None
+        if member is not None:
+            member_updated(before=member, after=member)
+
+
+def member_removed(member) -> None:
+    """
+    Removes a member that left the guild from the roster
+
+    Args:
+        member (_type_): Member object
+    """
+
+    roster: ModRoster | None = rosters.get(member.guild.id)
+    if roster is not None and member.id in roster.mods:
+        del roster.mods[member.id]
+        touch_roster(roster=roster)
+
+
+def role_changed(before, after=None) -> None:
+    """
+    Drops a guild's roster when the mod role is renamed or deleted
+
+    Args:
+        before (_type_): Role object before the change (or the deleted role)
+        after (_type_, optional): Role object after the change. Defaults to None.
+    """
+
+    role_names: set[str] = {before.name, after.name if after is not None else ""}
+    if config.MOD_ROLE_NAME in role_names:
+        invalidate_roster(guild_id=before.guild.id)
+
+
+def guild_updated(before, after) -> None:
+    """
+    Drops a guild's roster when its owner changes
+
+    Args:
+        before (_type_): Guild object before the update
+        after (_type_): Guild object after the update
+    """
+
+    if before.owner_id != after.owner_id:
+        invalidate_roster(guild_id=after.id)
+
+
+def invalidate_roster(guild_id: int) -> None:
+    """
+    Drops a guild's roster so it is rebuilt on next lookup
+
+    Args:
+        guild_id (int): ID of the guild
+    """
+
+    rosters.pop(guild_id, None)
+
+
+# helper functions
+def build_roster(guild) -> ModRoster:
+    """
+    Scans a guild's members once to build its roster
+
+    Args:
+        guild (_type_): Guild object
+
+    Returns:
+        ModRoster: The guild's moderator roster
+    """
+
+    roster = ModRoster(version=next(roster_versions), owner_id=guild.owner_id)
+
+    for member in guild.members:
+        if is_mod(member=member):
+            roster.mods[member.id] = member_names(member=member)
+
+    if guild.owner is not None:
+        roster.owner_names = member_names(member=guild.owner)
+
+    return roster
+
+
+def touch_roster(roster: ModRoster) -> None:
+    """
+    Bumps a roster's version and clears its derived lists
+
+    Args:
+        roster (ModRoster): The changed roster
+    """
+
+    roster.version = next(roster_versions)
+    roster.mod_names = None
+    roster.mod_ids = None
+
+
+def is_mod(member) -> bool:
+    """
+    Checks if a member has the mod role
+
+    Args:
+        member (_type_): Member object
+
+    Returns:
+        bool: Member has the mod role
+    """
+
+    return any(role.name == config.MOD_ROLE_NAME for role in member.roles)
+
+
+def member_names(member) -> tuple[str, str]:
+    """
+    Gets the lowercased, space-less username and nickname of a member
+
+    Args:
+        member (_type_): Member object
+
+    Returns:
+        tuple[str, str]: Username and nickname ("" when not set)
+    """
+
+    names: list[str] = []
+    for name in (member.name, member.nick):
+        cleaned_name: str = str(object=name).lower().replace(" ", "")
+        names.append(cleaned_name if cleaned_name != "none" else "")
+
+    return names[0], names[1]
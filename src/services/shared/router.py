@@ -0,0 +1,236 @@
+"""
+Routes gateway events to the services that apply to their channel.
+
+Services register a route per event with a check on the channel (or none, for
+routes that run in every channel). For every guild channel the matching routes
+are worked out once (up front for a guild's channels, on first event for
+threads) and kept until the guild's channels change, so an event in a channel
+no service cares about is dropped with one dict lookup.
+
+Channels missing from the cache are checked against the event's own channel
+object if it has one, else only routes without a check run; neither case is
+kept. The routes of an event run concurrently and are timed per route and
+shard.
+"""
+
+# imports
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    A service handler for an event
+    """
+
+    name: str
+    applies: Callable[[Any], bool] | None
+    handler: Callable[..., Awaitable[None]]
+
+
+@dataclass
+class RouteStats:
+    """
+    Timing of a route
+    """
+
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+routes: dict[str, list[Route]] = {}
+route_maps: dict[int, dict[tuple[str, int], tuple[Route, ...]]] = {}
+route_stats: dict[int, dict[str, RouteStats]] = {}
+dropped_events: dict[int, dict[str, int]] = {}
+
+
+# entry functions
+def add_route(
+    event: str,
+    name: str,
+    applies: Callable[[Any], bool] | None,
+    handler: Callable[..., Awaitable[None]],
+) -> None:
+    """
+    Registers a service handler for an event
+
+    Args:
+        event (str): Event name, e.g. "message"
+        name (str): Service name, used in the stats
+        applies (Callable[[Any], bool] | None): Checks if a channel is handled,
+        None to handle every channel
+        handler (Callable[..., Awaitable[None]]): Called with the event's kwargs
+    """
+
+    routes.setdefault(event, []).append(
+        Route(name=name, applies=applies, handler=handler)
+    )
+    route_maps.clear()
+
+
+async def dispatch(
+    event: str, guild, channel_id: int, event_channel=None, **kwargs
+) -> None:
+    """
+    Runs the routes of an event that apply to its channel
+
+    Args:
+        event (str): Event name
+        guild (_type_): Guild object (None for DMs, which are dropped)
+        channel_id (int): ID of the channel (or thread) of the event
+        event_channel (_type_, optional): The event's own channel object, used
+        when the channel is not in the guild's cache. Defaults to None.
+        **kwargs: Passed to the handlers
+    """
+
+    matched: tuple[Route, ...] = (
+        get_routes(
+            event=event,
+            guild=guild,
+            channel_id=channel_id,
+            event_channel=event_channel,
+        )
+        if guild is not None
+        else ()
+    )
+
+    # DMs always arrive on shard 0
+    shard_id: int = guild.shard_id if guild is not None else 0
+
+    if not matched:
+        shard_dropped: dict[str, int] = dropped_events.setdefault(shard_id, {})
+        shard_dropped[event] = shard_dropped.get(event, 0) + 1
+        return
+
+    if len(matched) == 1:
+        await run_route(event=event, route=matched[0], shard_id=shard_id, kwargs=kwargs)
+        return
+
+    await asyncio.gather(
+        *(
+            run_route(event=event, route=route, shard_id=shard_id, kwargs=kwargs)
+            for route in matched
+        )
+    )
+
+
+def build_route_map(guild) -> None:
+    """
+    Works out the routes of every channel of a guild up front
+
+    Args:
+        guild (_type_): Guild object
+    """
+
+    route_maps.pop(guild.id, None)
+    for channel in guild.channels:
+        for event in routes:
+            get_routes(event=event, guild=guild, channel_id=channel.id)
+
+
+def invalidate(guild_id: int) -> None:
+    """
+    Drops a guild's routes so they are worked out again on next use
+
+    Args:
+        guild_id (int): ID of the guild
+    """
+
+    route_maps.pop(guild_id, None)
+
+
+def get_route_stats(shard_id: int) -> dict[str, dict[str, float]]:
+    """
+    Gets the timing of every route and the number of dropped events of a shard
+
+    Args:
+        shard_id (int): ID of the shard (0 when not sharded)
+
+    Returns:
+        dict[str, dict[str, float]]: "event:service" -> calls, average and
+        max seconds, plus "dropped" -> event -> count
+    """
+
+    stats: dict[str, dict[str, float]] = {
+        name: {
+            "calls": route.calls,
+            "avg_seconds": route.total_seconds / route.calls if route.calls else 0.0,
+            "max_seconds": route.max_seconds,
+        }
+        for name, route in route_stats.get(shard_id, {}).items()
+    }
+    stats["dropped"] = dict(dropped_events.get(shard_id, {}))
+
+    return stats
+
+
+# helper functions
+def get_routes(
+    event: str, guild, channel_id: int, event_channel=None
+) -> tuple[Route, ...]:
+    """
+    Gets the routes of an event for a channel, working them out on first use
+
+    Args:
+        event (str): Event name
+        guild (_type_): Guild object
+        channel_id (int): ID of the channel (or thread)
+        event_channel (_type_, optional): The event's own channel object, used
+        when the channel is not in the guild's cache. Defaults to None.
+
+    Returns:
+        tuple[Route, ...]: Routes that apply to the channel
+    """
+
+    guild_map: dict[tuple[str, int], tuple[Route, ...]] = route_maps.setdefault(
+        guild.id, {}
+    )
+
+    matched: tuple[Route, ...] | None = guild_map.get((event, channel_id))
+    if matched is None:
+        channel = guild.get_channel_or_thread(channel_id)
+        checked_channel = channel if channel is not None else event_channel
+        matched = tuple(
+            route
+            for route in routes.get(event, [])
+            if route.applies is None
+            or (checked_channel is not None and route.applies(checked_channel))
+        )
+
+        # unknown channels are not cached, they may be a thread not seen yet
+        if channel is not None:
+            guild_map[(event, channel_id)] = matched
+
+    return matched
+
+
+async def run_route(
+    event: str, route: Route, shard_id: int, kwargs: dict[str, Any]
+) -> None:
+    """
+    Runs a route's handler and records how long it took
+
+    Args:
+        event (str): Event name
+        route (Route): The route
+        shard_id (int): ID of the shard the event came in on
+        kwargs (dict[str, Any]): Passed to the handler
+    """
+
+    started: float = time.perf_counter()
+
+    try:
+        await route.handler(**kwargs)
+
+    finally:
+        elapsed: float = time.perf_counter() - started
+        stats: RouteStats = route_stats.setdefault(shard_id, {}).setdefault(
+            f"{event}:{route.name}", RouteStats()
+        )
+        stats.calls += 1
+        stats.total_seconds += elapsed
+        stats.max_seconds = max(stats.max_seconds, elapsed)
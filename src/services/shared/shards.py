@@ -0,0 +1,106 @@
+"""
+Per-shard startup and metrics.
+
+Each shard's guilds are set up as soon as that shard is ready, so a slow shard
+does not hold up the others. Bot-wide setup runs once, with the first shard.
+Guild caches are keyed by guild ID, so each one belongs to exactly one shard;
+this module keeps each shard's readiness and hands out its route stats.
+"""
+
+# imports
+import time
+from dataclasses import dataclass
+
+import services.shared.router as router
+from config import logger
+
+
+@dataclass
+class ShardState:
+    """
+    Readiness of a shard
+    """
+
+    shard_id: int
+    ready_count: int = 0
+    first_ready_seconds: float | None = None
+    last_ready_at: float | None = None
+
+
+started_at: float = time.monotonic()
+shard_states: dict[int, ShardState] = {}
+bot_started: bool = False
+
+
+# entry functions
+def shard_ready(bot, shard_id: int) -> bool:
+    """
+    Records that a shard is ready (again, after a new session)
+
+    Args:
+        bot (_type_): Discord bot object
+        shard_id (int): ID of the shard (0 when not sharded)
+
+    Returns:
+        bool: This is the first ready shard of the process, bot-wide setup
+        should run
+    """
+
+    global bot_started  # pylint: disable=global-statement
+
+    now: float = time.monotonic()
+    state: ShardState = shard_states.setdefault(shard_id, ShardState(shard_id=shard_id))
+    state.ready_count += 1
+    state.last_ready_at = now
+    if state.first_ready_seconds is None:
+        state.first_ready_seconds = now - started_at
+
+    logger.info(
+        f"• SHARD {shard_id} READY: {len(get_shard_guilds(bot=bot, shard_id=shard_id))} "
+        f"guilds after {now - started_at:.1f}s"
+    )
+
+    first_start: bool = not bot_started
+    bot_started = True
+    return first_start
+
+
+def get_shard_guilds(bot, shard_id: int) -> list:
+    """
+    Gets the guilds of a shard
+
+    Args:
+        bot (_type_): Discord bot object
+        shard_id (int): ID of the shard (0 when not sharded)
+
+    Returns:
+        list: Guild objects
+    """
+
+    return [guild for guild in bot.guilds if guild.shard_id == shard_id]
+
+
+def get_shard_stats(bot) -> dict[int, dict]:
+    """
+    Gets the metrics of every shard of this process
+
+    Args:
+        bot (_type_): Discord bot object
+
+    Returns:
+        dict[int, dict]: Shard ID -> guild count, latency, ready count,
+        seconds to first ready and route stats
+    """
+
+    latencies: dict[int, float] = dict(getattr(bot, "latencies", [(0, bot.latency)]))
+
+    return {
+        shard_id: {
+            "guilds": len(get_shard_guilds(bot=bot, shard_id=shard_id)),
+            "latency": latencies.get(shard_id),
+            "ready_count": state.ready_count,
+            "first_ready_seconds": state.first_ready_seconds,
+            "routes": router.get_route_stats(shard_id=shard_id),
+        }
+        for shard_id, state in shard_states.items()
+    }
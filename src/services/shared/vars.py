@@ -6,3 +6,75 @@ NA_MOD_NAMES_LIST: list[str] = [
     "moderator",
     "administrator",
 ]
+
+# look-alike characters -> ascii (applied after NFKD, in the style of the
+# Unicode TR39 confusables skeleton)
+CONFUSABLES: dict[str, str] = {
+    # cyrillic
+    "а": "a", "в": "b", "г": "r", "е": "e", "ё": "e",
+    "к": "k", "м": "m", "н": "h", "о": "o", "п": "n", "р": "p", "с": "c",
+    "т": "t", "у": "y", "х": "x", "ь": "b", "і": "i", "ї": "i", "ј": "j",
+    "ѕ": "s", "ԁ": "d", "ԛ": "q", "ԝ": "w", "ӏ": "l", "һ": "h",
+    "А": "A", "В": "B", "Е": "E", "К": "K", "М": "M", "Н": "H",
+    "О": "O", "Р": "P", "С": "C", "Т": "T", "У": "Y", "Х": "X", "І": "I",
+    "Ј": "J", "Ѕ": "S", "Ԁ": "D", "Ԛ": "Q", "Ԝ": "W", "Ӏ": "l", "Һ": "h",
+    # greek
+    "α": "a", "β": "b", "γ": "y", "ε": "e", "η": "n", "ι": "i", "κ": "k",
+    "ν": "v", "ο": "o", "ρ": "p", "σ": "o", "τ": "t", "υ": "u", "χ": "x",
+    "ω": "w", "Α": "A", "Β": "B", "Ε": "E", "Ζ": "Z", "Η": "H", "Ι": "I",
+    "Κ": "K", "Μ": "M", "Ν": "N", "Ο": "O", "Ρ": "P", "Τ": "T", "Υ": "Y",
+    "Χ": "X",
+    # armenian
+    "ա": "w", "հ": "h", "ո": "n", "ս": "u", "օ": "o", "Օ": "O", "Ս": "U",
+    # cherokee
+    "Ꭺ": "A", "Ᏼ": "B", "Ꮯ": "C", "Ꭰ": "D", "Ꭼ": "E", "Ꮐ": "G", "Ꮋ": "H",
+    "Ꭻ": "J", "Ꮶ": "K", "Ꮮ": "L", "Ꮇ": "M", "Ꮲ": "P", "Ꮪ": "S", "Ꭲ": "T",
+    "Ꮩ": "V", "Ꮃ": "W", "Ꮓ": "Z",
+    # latin small capitals, ipa and other latin look-alikes
+    "ᴀ": "a", "ʙ": "b", "ᴄ": "c", "ᴅ": "d", "ᴇ": "e", "ɢ": "g", "ʜ": "h",
+    "ɪ": "i", "ᴊ": "j", "ᴋ": "k", "ʟ": "l", "ᴍ": "m", "ɴ": "n", "ᴏ": "o",
+    "ᴘ": "p", "ʀ": "r", "ꜱ": "s", "ᴛ": "t", "ᴜ": "u", "ᴠ": "v", "ᴡ": "w",
+    "ʏ": "y", "ᴢ": "z", "ı": "i", "ȷ": "j", "ǀ": "l", "ø": "o", "Ø": "O",
+    "đ": "d", "Đ": "D", "ħ": "h", "ł": "l", "Ł": "L", "ŧ": "t", "ƅ": "b",
+    "ɡ": "g",
+    # invisible characters
+    "\u00ad": "", "\u200b": "", "\u200c": "", "\u200d": "", "\u2060": "",
+    "\ufeff": "",
+}  # fmt: skip
+
+# unicode blocks of combining marks dropped by the skeleton
+COMBINING_MARK_RANGES: list[tuple[int, int]] = [
+    (0x0300, 0x036F),
+    (0x1AB0, 0x1AFF),
+    (0x1DC0, 0x1DFF),
+    (0x20D0, 0x20FF),
+    (0xFE20, 0xFE2F),
+]
+
+# mod-log priorities (lower goes first)
+LOG_PRIORITY_ACTION: int = 0
+LOG_PRIORITY_INFO: int = 1
+
+# mod-log digests
+LOG_FLUSH_SECONDS: float = 5.0
+LOG_DIGEST_MAX_LINES: int = 25
+LOG_MAX_PENDING: int = 500
+DISCORD_MESSAGE_LIMIT: int = 2000
+
+# most user IDs one gateway member query may ask for
+QUERY_MEMBERS_MAX_IDS: int = 100
+
+# moderation action priorities (lower goes first)
+ACTION_PRIORITY_BAN: int = 0
+ACTION_PRIORITY_KICK: int = 1
+ACTION_PRIORITY_DELETE: int = 2
+ACTION_PRIORITY_ROLE: int = 2
+ACTION_PRIORITY_LOG: int = 4
+
+# moderation action executor
+EXECUTOR_GUILD_CONCURRENCY: int = 2
+EXECUTOR_MAX_RETRIES: int = 3
+EXECUTOR_BACKOFF_SECONDS: float = 1.0
+
+# seconds between metrics log lines (cache, executor, route and shard stats)
+METRICS_LOG_SECONDS: int = 300
@@ -2,11 +2,276 @@
 Service that checks messages for spam content
 """
 
+import asyncio
+import json
+import os
 import re
-from typing import List
+from typing import Any, List, NamedTuple
 
+import services.shared.executor as executor
 import services.shared.functions as shared
 from config import logger
+from services.shared.vars import (
+    ACTION_PRIORITY_DELETE,
+    ACTION_PRIORITY_KICK,
+    LOG_PRIORITY_ACTION,
+)
+from services.spam.vars import SPAM_KEYWORDS, SPAM_PATTERNS, SPAM_RULES_POLL_SECONDS
+
+SPAM_RULES_FILEPATH: str = os.path.join(
+    os.getcwd(), "src", "services", "spam", ".spamRules.json"
+)
+
+KEYWORD_GROUP: str = "kw"
+
+
+class SpamMatcher(NamedTuple):
+    """
+    Compiled spam rule set
+    """
+
+    pattern: re.Pattern[str]
+    groups: dict[str, str]
+    keywords: dict[str, str]
+
+
+def compile_spam_rules(keywords: list[str], patterns: dict[str, str]) -> SpamMatcher:
+    """
+    Compiles every spam rule into a single case-insensitive regex so a message is
+    scanned once no matter how many rules there are. Literal keywords are folded
+    into a prefix trie, regex rules each get their own named group. Messages are
+    matched as their skeleton, so the rules are skeletonized the same way.
+
+    Args:
+        keywords (list[str]): Literal spam phrases
+        patterns (dict[str, str]): Rule name -> regex pattern
+
+    Returns:
+        SpamMatcher: Compiled pattern, group -> rule name map, keyword lookup
+    """
+
+    branches: list[str] = []
+    groups: dict[str, str] = {}
+
+    keyword_map: dict[str, str] = {
+        shared.skeleton(text=keyword).lower(): keyword for keyword in keywords
+    }
+    if keyword_map:
+        branches.append(f"(?P<{KEYWORD_GROUP}>{build_trie_pattern(words=keyword_map)})")
+
+    for index, (name, rule) in enumerate(patterns.items()):
+        pattern: str = shared.skeleton(text=rule)
+        re.compile(pattern)  # fail on the bad rule, not on the combined pattern
+        group: str = f"r{index}"
+        groups[group] = name
+        branches.append(f"(?P<{group}>{pattern})")
+
+    combined: str = "|".join(branches) if branches else "(?!)"
+
+    return SpamMatcher(
+        pattern=re.compile(combined, flags=re.IGNORECASE),
+        groups=groups,
+        keywords=keyword_map,
+    )
+
+
+def build_trie_pattern(words) -> str:
+    """
+    Builds a regex that matches any of the given words, sharing common prefixes
+
+    Args:
+        words (Iterable[str]): Lowercased literal words
+
+    Returns:
+        str: Regex pattern
+    """
+
+    trie: dict = {}
+    for word in words:
+        node: dict = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def node_pattern(node: dict) -> str:
+        is_end: bool = "" in node
+        branches: list[str] = [
+            re.escape(char) + node_pattern(child)
+            for char, child in sorted(node.items())
+            if char != ""
+        ]
+
+        if not branches:
+            return ""
+
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+
+        group: str = f"(?:{'|'.join(branches)})"
+        return f"{group}?" if is_end else group
+
+    return node_pattern(trie)
+
+
+class SpamIndex(NamedTuple):
+    """
+    A versioned, compiled snapshot of the spam rules
+    """
+
+    version: int
+    source_mtime: float | None
+    matcher: SpamMatcher
+
+
+# swapped as a whole on reload, readers keep the snapshot they grabbed
+spam_index: SpamIndex = SpamIndex(
+    version=0,
+    source_mtime=None,
+    matcher=compile_spam_rules(keywords=SPAM_KEYWORDS, patterns=SPAM_PATTERNS),
+)
+spam_rule_watcher: asyncio.Task | None = None
+
+
+def load_spam_rules(filepath: str) -> tuple[list[str], dict[str, str]]:
+    """
+    Reads spam rules from a json file
+
+    Args:
+        filepath (str): Path of the rules file
+
+    Returns:
+        tuple[list[str], dict[str, str]]: Keywords, rule name -> regex pattern
+    """
+
+    with open(file=filepath, mode="r", encoding="utf-8") as file:
+        values: dict[str, Any] = json.load(fp=file)
+
+    keywords: list[str] = [
+        str(object=keyword) for keyword in values.get("keywords", [])
+    ]
+    patterns: dict[str, str] = {
+        str(object=name): str(object=pattern)
+        for name, pattern in values.get("patterns", {}).items()
+    }
+
+    return keywords, patterns
+
+
+def get_rules_mtime(filepath: str) -> float | None:
+    """
+    Gets the modified time of the rules file
+
+    Args:
+        filepath (str): Path of the rules file
+
+    Returns:
+        float | None: Modified time, None if the file does not exist
+    """
+
+    try:
+        return os.stat(filepath).st_mtime
+
+    except FileNotFoundError:
+        return None
+
+
+def build_spam_index(filepath: str, version: int, mtime: float) -> SpamIndex:
+    """
+    Loads and compiles the rules file into a new index (runs off the event loop)
+
+    Args:
+        filepath (str): Path of the rules file
+        version (int): Version number of the new index
+        mtime (float): Modified time of the rules file that is loaded
+
+    Returns:
+        SpamIndex: The compiled index
+    """
+
+    keywords, patterns = load_spam_rules(filepath=filepath)
+    matcher: SpamMatcher = compile_spam_rules(keywords=keywords, patterns=patterns)
+
+    return SpamIndex(version=version, source_mtime=mtime, matcher=matcher)
+
+
+async def reload_spam_rules(filepath: str = SPAM_RULES_FILEPATH) -> bool:
+    """
+    Recompiles the spam rules if the rules file changed and swaps in the new index.
+    The current index stays in place if the file is missing or invalid.
+
+    Args:
+        filepath (str): Path of the rules file
+
+    Returns:
+        bool: A new index was swapped in
+    """
+
+    global spam_index  # pylint: disable=global-statement
+
+    mtime: float | None = await asyncio.to_thread(get_rules_mtime, filepath)
+    if mtime is None or mtime == spam_index.source_mtime:
+        return False
+
+    try:
+        new_index: SpamIndex = await asyncio.to_thread(
+            build_spam_index, filepath, spam_index.version + 1, mtime
+        )
+
+    except (OSError, ValueError, AttributeError, re.error) as e:
+        logger.error(f"Could not load spam rules from {filepath}: {e}")
+        spam_index = spam_index._replace(source_mtime=mtime)
+        return False
+
+    spam_index = new_index
+    logger.info(f"Loaded spam rules version {new_index.version}")
+
+    return True
+
+
+async def watch_spam_rules(filepath: str = SPAM_RULES_FILEPATH) -> None:
+    """
+    Polls the rules file and hot-reloads it when it changes
+
+    Args:
+        filepath (str): Path of the rules file
+    """
+
+    while True:
+        await reload_spam_rules(filepath=filepath)
+        await asyncio.sleep(SPAM_RULES_POLL_SECONDS)
+
+
+def start_spam_rule_watcher() -> None:
+    """
+    Starts the rules file watcher once (on_ready can fire more than once)
+    """
+
+    global spam_rule_watcher  # pylint: disable=global-statement
+
+    if spam_rule_watcher is None or spam_rule_watcher.done():
+        spam_rule_watcher = asyncio.create_task(watch_spam_rules())
+
+
+def match_spam_rule(text: str) -> str | None:
+    """
+    Finds the spam rule a message matches (look-alike characters are normalized)
+
+    Args:
+        text (str): Message that is getting checked for spam
+
+    Returns:
+        str | None: Name of the matched rule, None if the message is clean
+    """
+
+    matcher: SpamMatcher = spam_index.matcher
+    match: re.Match[str] | None = matcher.pattern.search(shared.skeleton(text=text))
+    if match is None:
+        return None
+
+    if match.lastgroup == KEYWORD_GROUP:
+        return matcher.keywords.get(match.group(KEYWORD_GROUP).lower(), KEYWORD_GROUP)
+
+    return matcher.groups.get(str(object=match.lastgroup))
 
 
 def is_spam(text: str) -> bool:
@@ -20,17 +285,7 @@ def is_spam(text: str) -> bool:
         bool: Text contains common spam words, urls, or @everyone
     """
 
-    spam_patterns: list[str] = [
-        r"@everyone",
-        r"US stock investment group",
-        r"https://chat\.whatsapp\.com/\w+",
-    ]
-
-    for pattern in spam_patterns:
-        if re.search(pattern=pattern, string=text, flags=re.IGNORECASE):
-            return True
-
-    return False
+    return match_spam_rule(text=text) is not None
 
 
 async def check_msg_for_spam(bot, discord, message) -> None:
@@ -45,18 +300,18 @@ async def check_msg_for_spam(bot, discord, message) -> None:
     """
 
     msg_content: str = message.content
-    found_spam: bool = is_spam(text=msg_content)
+    spam_rule: str | None = match_spam_rule(text=msg_content)
 
-    if found_spam:
+    if spam_rule is not None:
         member = message.author
         if member.bot:
             return
 
         # Check message author is not mod
         mod_names: List[str] = []
-        mod_ids: List[int] = []
+        mod_ids: set[int] = set()
 
-        mod_info: tuple[list[str], list[int]] | None = await shared.get_mod_info(
+        mod_info: tuple[list[str], set[int]] | None = await shared.get_mod_info(
             bot=bot, guild_id=member.guild.id
         )
 
@@ -68,19 +323,34 @@ async def check_msg_for_spam(bot, discord, message) -> None:
 
         # Log spam caught
         clean_msg_content: str = msg_content.replace("@", "at-")
+        clean_spam_rule: str = spam_rule.replace("@", "at-")
 
         log_message: str = (
-            f"⚠️ SPAM CAUGHT - <@{message.author.id}>  Content: {clean_msg_content}"
+            f"⚠️ SPAM CAUGHT ({clean_spam_rule}) - <@{message.author.id}>  "
+            f"Content: {clean_msg_content}"
         )
 
         logger.info(log_message)
         await shared.log_event(
-            discord=discord, member=message.author, result_msg=log_message
+            discord=discord,
+            member=message.author,
+            result_msg=log_message,
+            priority=LOG_PRIORITY_ACTION,
         )
 
         # Delete message and kick member
-        await message.delete()
-        await message.author.kick()
+        executor.submit(
+            guild_id=member.guild.id,
+            priority=ACTION_PRIORITY_DELETE,
+            route=f"delete:{message.channel.id}",
+            action=message.delete,
+        )
+        executor.submit(
+            guild_id=member.guild.id,
+            priority=ACTION_PRIORITY_KICK,
+            route=f"kick:{member.guild.id}",
+            action=message.author.kick,
+        )
 
     else:
         return
@@ -0,0 +1,21 @@
+"""
+Variables for the spam service
+"""
+
+# rules (here and in .spamRules.json) are matched case-insensitively against the
+# skeleton of a message (shared.skeleton: look-alike, fullwidth and accented
+# characters folded to plain ascii); the rules are skeletonized the same way
+
+# literal phrases
+SPAM_KEYWORDS: list[str] = [
+    "@everyone",
+    "US stock investment group",
+]
+
+# regex rules: rule name -> pattern
+SPAM_PATTERNS: dict[str, str] = {
+    "whatsapp_invite": r"https://chat\.whatsapp\.com/\w+",
+}
+
+# seconds between checks of the rules file for changes
+SPAM_RULES_POLL_SECONDS: int = 30
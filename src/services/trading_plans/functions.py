@@ -43,8 +43,22 @@ def in_trading_plan(message) -> bool:
         bool: Message is from trading-plans channel
     """
 
-    if hasattr(message.channel, "parent_id") and config.PLAN_CHANNEL_ID is not None:
-        return str(object=message.channel.parent_id) == config.PLAN_CHANNEL_ID
+    return in_trading_plan_channel(channel=message.channel)
+
+
+def in_trading_plan_channel(channel) -> bool:
+    """
+    Checks a channel is a post (thread) of the Trading Plan channel
+
+    Args:
+        channel (discord channel): Discord channel or thread
+
+    Returns:
+        bool: Channel is in the trading-plans channel
+    """
+
+    if hasattr(channel, "parent_id") and config.PLAN_CHANNEL_ID is not None:
+        return str(object=channel.parent_id) == config.PLAN_CHANNEL_ID
 
     return False
 
@@ -8,8 +8,8 @@ from typing import Any
 
 import config
 import services.verify.functions as verify
+import services.verify.rotation as rotation
 from config import logger
-from services.verify.vars import reaction_emojis
 
 
 # entry functions
@@ -55,7 +55,7 @@ async def command_new_verification(
     if not valid_verification_request:
         return
 
-    verify_channel = await verify.get_verification_channel(bot=bot)
+    verify_channel = verify.get_verification_channel(guild=interaction.guild)
     if verify_channel is None:
         await interaction.response.send_message(
             f"The Channel {config.VERIFY_CHANNEL} does not exist."
@@ -77,14 +77,24 @@ async def command_new_verification(
         )
 
         if confirm_new_verification.content != "YES":
-            await verify_channel.purge(limit=2)
+            rotation.schedule_cleanup(channel=verify_channel)
             return
 
-        map_new_answers(url=url, question=question, answer=answer, a=a, b=b, c=c, d=d)
-        await send_new_verification(verify_channel=verify_channel, embed=embed)
+        new_verify: dict[str, str] = map_new_answers(
+            url=url,
+            question=question,
+            answer=answer,
+            a=a,
+            b=b,
+            c=c,
+            d=d,
+        )
+        await rotation.add_question(
+            discord=discord, channel=verify_channel, question=new_verify
+        )
 
     except Exception as e:  # pylint: disable=broad-exception-caught, unused-variable
-        await verify_channel.purge(limit=1)
+        rotation.schedule_cleanup(channel=verify_channel)
 
 
 # helper functions
@@ -134,12 +144,11 @@ async def is_valid_verification_setup_request(
 
 def map_new_answers(
     url: str, question: str, answer: str, a: str, b: str, c: str, d: str
-) -> None:
+) -> dict[str, str]:
     """
-    Sets new answers in the global CURRENT_VERIFY {}
+    Maps new answers to the fields of a verification question
 
     Args:
-        interaction (_type_): Interaction object
         url (str): Url where answer is
         question (str): Question
         answer (str): Answer to question
@@ -147,6 +156,9 @@ def map_new_answers(
         b (str): Option B
         c (str): Option C
         d (str): Option D
+
+    Returns:
+        dict[str, str]: The verification question
     """
 
     answer_map: dict[str, Any] = {"A": a, "B": b, "C": c, "D": d}
@@ -160,24 +172,4 @@ def map_new_answers(
     new_verify["choice_c"] = c
     new_verify["choice_d"] = d
     new_verify["url"] = url
-    verify.save_verify_answer(values=new_verify)
-
-
-async def send_new_verification(verify_channel, embed) -> None:
-    """
-    Deletes the old verification, sends the new verificaiton, and adds reactions
-
-    Args:
-        verify_channel (_type_): Discord channel object
-        embed (_type_): Discord embed object
-    """
-
-    await verify_channel.purge(limit=None)
-
-    new_verification_msg = await verify_channel.send(embed=embed)
-    for emoji in reaction_emojis.values():
-        await new_verification_msg.add_reaction(emoji)
-
-    current_verify: dict[str, str] = verify.load_verify_answer()
-    current_verify["msgID"] = str(object=new_verification_msg.id)
-    verify.save_verify_answer(values=current_verify)
+    return new_verify
@@ -4,126 +4,204 @@ Service for giving discord verification role
 """
 
 # imports
-import json
-import os
-from typing import Any, List
+import asyncio
+import functools
+from typing import Any
 
 import config
+import services.shared.executor as executor
 import services.shared.functions as shared
-import services.verify.functions as verify
+import services.shared.resolver as resolver
+import services.verify.store as verify_store
 from config import logger
-from services.verify.vars import reaction_emojis
-
-VERIFICATION_FILEPATH: str = os.path.join(
-    os.getcwd(), "src", "services", "verify", ".currentVerify.json"
+from services.shared.vars import (
+    ACTION_PRIORITY_DELETE,
+    ACTION_PRIORITY_KICK,
+    ACTION_PRIORITY_ROLE,
+    LOG_PRIORITY_ACTION,
 )
+from services.verify.vars import reaction_emojis
 
 
 # entry functions
 @logger.catch
-async def check_verification(bot, discord, payload) -> None:
+async def check_verifications(
+    bot, discord, guild_id: int, payloads: list
+) -> dict[int, asyncio.Future]:
     """
-    Service for checking Discord's users request to be verified
+    Service for checking a batch of Discord users' requests to be verified
+    (one reaction per member, all on the verification message of one guild)
 
     Args:
         bot (_type_): Discord bot object
         discord (_type_): Discord object
-        payload (_type_): Discord on_raw_reation_add payload object
-    """
+        guild_id (int): ID of the guild
+        payloads (list): Discord on_raw_reation_add payload objects
 
-    member = payload.member
+    Returns:
+        dict[int, asyncio.Future]: Member ID -> queued role grant or kick
+    """
 
-    current_verify: dict[str, str] = verify.load_verify_answer()
+    current_verify: dict[str, Any] = await verify_store.load_verify_answer(
+        guild_id=guild_id
+    )
     if not current_verify:
         error_msg: str = (
             f"@{config.MOD_ROLE_NAME} - UNABLE TO LOAD VERIFICATION ANSWERS"
         )
-        await shared.log_event(discord=discord, member=member, result_msg=error_msg)
+        await shared.log_event(
+            discord=discord,
+            member=payloads[0].member,
+            result_msg=error_msg,
+            priority=LOG_PRIORITY_ACTION,
+        )
 
-    message = await bot.get_channel(payload.channel_id).fetch_message(
-        payload.message_id
+    mod_info: tuple[list[str], set[int]] | None = await shared.get_mod_info(
+        bot=bot, guild_id=guild_id
     )
-    reaction = discord.utils.get(message.reactions, emoji=str(object=payload.emoji))
+    mod_ids: set[int] | None = mod_info[1] if mod_info is not None else None
 
-    if await is_user_verified(bot=bot, member=member, reaction=reaction):
-        return
+    actions: dict[int, asyncio.Future] = {}
+    verified_members: list = []
+    for payload in payloads:
+        member = payload.member
+
+        # partial message, reactions are removed without fetching the message
+        message = bot.get_channel(payload.channel_id).get_partial_message(
+            payload.message_id
+        )
+        emoji = payload.emoji
 
-    try:
-        if not is_correct_answer(reaction=reaction, current_verify=current_verify):
-            logger.info(f"• FAILED VERFIY: {member}, {member.nick}")
-            await reaction.remove(member)
-            await reaction.message.guild.kick(member)
-            return
+        if is_user_verified(member=member, mod_ids=mod_ids):
+            remove_reaction(message=message, emoji=emoji, member=member)
+            continue
 
-        logger.info(f"• SUCCESSFUL VERFIY: {member}, {member.nick}")
-        await reaction.remove(member)
-        await give_verification(discord=discord, reaction=reaction, user=member)
+        try:
+            remove_reaction(message=message, emoji=emoji, member=member)
 
-    except Exception as e:  # pylint: disable=broad-exception-caught, unused-variable
-        logger.error(f"• EXCEPTION: {member} --- {e}")
+            if not is_correct_answer(emoji=emoji, current_verify=current_verify):
+                logger.info(f"• FAILED VERFIY: {member}, {member.nick}")
+                actions[member.id] = executor.submit(
+                    guild_id=guild_id,
+                    priority=ACTION_PRIORITY_KICK,
+                    route=f"kick:{guild_id}",
+                    action=functools.partial(member.guild.kick, member),
+                )
+                continue
 
+            logger.info(f"• SUCCESSFUL VERFIY: {member}, {member.nick}")
+            verified_members.append(member)
 
-# helper functions
-def save_verify_answer(values: dict[str, str]) -> None:
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error(f"• EXCEPTION: {member} --- {e}")
+
+    if verified_members:
+        actions.update(give_verification(discord=discord, members=verified_members))
+
+    return actions
+
+
+@logger.catch
+async def start_verification_store(bot) -> None:
     """
-    Saves verification answers to json file
+    Service for opening the verification store and moving the old single-guild
+    answers to the guild whose verification channel has their message
 
     Args:
-        values (dict[str, str]): The new verification answers
+        bot (_type_): Discord bot object
     """
 
-    with open(file=VERIFICATION_FILEPATH, mode="w", encoding="utf-8") as file:
-        json.dump(obj=values, fp=file)
+    legacy_values: dict[str, Any] = await verify_store.load_legacy_answers()
+    msg_id: Any = legacy_values.get("msgID")
+    if msg_id is None:
+        return
 
+    for guild in bot.guilds:
+        channel = get_verification_channel(guild=guild)
+        if channel is None:
+            continue
 
-def load_verify_answer() -> dict[str, str]:
-    """
-    Reads in current verification answers from json file
+        current_verify: dict[str, Any] = await verify_store.load_verify_answer(
+            guild_id=guild.id
+        )
+        if str(object=current_verify.get("msgID")) == str(object=msg_id):
+            return  # migrated on an earlier start
 
-    Returns:
-        dict[str, str]: The current verification answers
-    """
+        # guilds with answers are never migrated to, no need to look
+        if current_verify:
+            continue
 
-    values: dict[str, str] = {}
+        try:
+            await channel.get_partial_message(int(msg_id)).fetch()
 
-    try:
-        with open(file=VERIFICATION_FILEPATH, mode="r", encoding="utf-8") as file:
-            values = json.load(fp=file)
+        except Exception:  # pylint: disable=broad-exception-caught
+            continue
 
-    except (FileNotFoundError, json.JSONDecodeError):
-        logger.critical("Could not load verification answers.")
+        await verify_store.migrate_legacy_answers(
+            guild_id=guild.id, values=legacy_values
+        )
+        return
 
-    return values
+    logger.warning(
+        f"• LEGACY VERIFICATION ANSWERS NOT MIGRATED: message {msg_id} is in no "
+        "verify channel without answers"
+    )
 
 
-async def get_verification_channel(bot) -> Any | None:
+# helper functions
+def get_verification_channel(guild) -> Any | None:
     """
-    Gets the verification channel from the Discord bot object
+    Gets the verification channel of a guild
 
     Args:
-        bot (_type_): Discord bot object
+        guild (_type_): Guild object
 
     Returns:
         Any | None: Discord channel object
     """
 
-    verify_channel = None
-    bot_channels = bot.get_all_channels()
+    return resolver.get_channel(guild=guild, name=config.VERIFY_CHANNEL)
+
+
+def is_verification_channel(channel) -> bool:
+    """
+    Checks a channel is its guild's verification channel
+
+    Args:
+        channel (_type_): Discord channel object
 
-    for channel in bot_channels:
-        if channel.name == config.VERIFY_CHANNEL:
-            verify_channel = channel
-            break
+    Returns:
+        bool: Channel is the verification channel
+    """
 
-    return verify_channel
+    return channel.id == resolver.get_channel_id(
+        guild=channel.guild, name=config.VERIFY_CHANNEL
+    )
 
 
-def is_correct_answer(reaction, current_verify: dict) -> bool:
+def is_verification_message(message_id: int, current_verify: dict) -> bool:
     """
-    Checks the given reaction to the correct answer in the json file
+    Checks a reaction is on the current verification message (any message
+    while no message ID is stored)
 
     Args:
-        reaction (_type_): Discord reaction
+        message_id (int): ID of the reacted message
+        current_verify (dict): Current verification system
+
+    Returns:
+        bool: The reaction is a verification answer
+    """
+
+    verify_msg_id: Any = current_verify.get("msgID")
+    return verify_msg_id is None or str(object=message_id) == str(object=verify_msg_id)
+
+
+def is_correct_answer(emoji, current_verify: dict) -> bool:
+    """
+    Checks the given reaction emoji to the correct answer of the guild
+
+    Args:
+        emoji (_type_): Discord PartialEmoji of the reaction
         current_verify (dict): Current verification system
 
     Returns:
@@ -131,7 +209,7 @@ def is_correct_answer(reaction, current_verify: dict) -> bool:
     """
 
     reaction_map: dict[str, str] = {"🇦": "A", "🇧": "B", "🇨": "C", "🇩": "D"}
-    mapped_reaction: str | None = reaction_map.get(reaction.emoji)
+    mapped_reaction: str | None = reaction_map.get(str(object=emoji))
 
     return str(object=mapped_reaction) == str(object=current_verify["answer"]).upper()
 
@@ -181,14 +259,13 @@ async def create_verification_question(discord, question, a, b, c, d, url):
     return embed
 
 
-async def is_user_verified(bot, member, reaction) -> bool:
+def is_user_verified(member, mod_ids: set[int] | None) -> bool:
     """
     Checks for verification for a Discord member (ignores mods)
 
     Args:
-        bot (_type_): _description_
         member (_type_): _description_
-        reaction (_type_): _description_
+        mod_ids (set[int] | None): IDs of the guild's mods
 
     Returns:
         bool: Is the user verified or a mod
@@ -201,32 +278,53 @@ async def is_user_verified(bot, member, reaction) -> bool:
         return True
 
     member_roles = [role.name for role in member.roles]
-    mod_info: tuple[list[str], list[int]] | None = await shared.get_mod_info(
-        bot=bot, guild_id=member.guild.id
-    )
 
-    mod_ids: List[int] = []
-    if mod_info is not None:
-        _, mod_ids = mod_info
+    return (mod_ids is None) or ("verified" in member_roles) or (member.id in mod_ids)
 
-    if (mod_ids is None) or ("verified" in member_roles) or (member.id in mod_ids):
-        await reaction.remove(member)
-        return True
 
-    else:
-        return False
+def remove_reaction(message, emoji, member) -> None:
+    """
+    Queues removing a member's reaction with the action executor
+
+    Args:
+        message (_type_): Message or PartialMessage object
+        emoji (_type_): Emoji of the reaction
+        member (_type_): Member object
+    """
+
+    executor.submit(
+        guild_id=member.guild.id,
+        priority=ACTION_PRIORITY_DELETE,
+        route=f"reaction:{message.channel.id}",
+        action=functools.partial(message.remove_reaction, emoji, member),
+    )
 
 
-async def give_verification(discord, reaction, user) -> None:
+def give_verification(discord, members: list) -> dict[int, asyncio.Future]:
     """
-    Gives the verification role to a Discord member
+    Gives the verification role to a batch of Discord members of one guild.
+    Discord has no bulk role endpoint, so the role is resolved once and one
+    grant per member is queued with the action executor.
 
     Args:
         discord (_type_): Discord object
-        reaction (_type_): Reaction object
-        user (_type_): User object
+        members (list): Member objects
+
+    Returns:
+        dict[int, asyncio.Future]: Member ID -> queued role grant
     """
 
-    role = discord.utils.get(reaction.message.guild.roles, name=config.VERIFIED_ROLE)
-    if role:
-        await user.add_roles(role)
+    guild = members[0].guild
+    role = resolver.get_role(guild=guild, name=config.VERIFIED_ROLE)
+    if not role:
+        return {}
+
+    return {
+        member.id: executor.submit(
+            guild_id=guild.id,
+            priority=ACTION_PRIORITY_ROLE,
+            route=f"role:{guild.id}",
+            action=functools.partial(member.add_roles, role),
+        )
+        for member in members
+    }
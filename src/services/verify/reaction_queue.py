@@ -0,0 +1,168 @@
+"""
+Per-guild queue of verification reactions.
+
+Reactions on the verification message are queued by member: a member's first
+answer is the one checked, any other reaction they add while it is queued,
+until its role grant/kick went through and for VERIFY_ANSWERED_SECONDS after
+is just removed. Each guild's queue is drained in batches of VERIFY_BATCH_SIZE
+by at most VERIFY_WORKER_CONCURRENCY workers.
+"""
+
+# imports
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+import services.verify.functions as verify
+import services.verify.store as verify_store
+from services.verify.vars import (
+    VERIFY_ANSWERED_SECONDS,
+    VERIFY_BATCH_SIZE,
+    VERIFY_WORKER_CONCURRENCY,
+)
+
+
+@dataclass
+class ReactionQueue:
+    """
+    Queued and in-progress verification answers of a guild
+    """
+
+    payloads: dict[int, Any] = field(default_factory=dict)
+    in_flight: set[int] = field(default_factory=set)
+    answered: set[int] = field(default_factory=set)
+    answered_expiry: deque = field(default_factory=deque)
+    workers: set[asyncio.Task] = field(default_factory=set)
+
+
+reaction_queues: dict[int, ReactionQueue] = {}
+
+
+# entry functions
+async def queue_reaction(bot, discord, payload) -> None:
+    """
+    Queues a verification reaction, keeping only a member's first answer
+
+    Args:
+        bot (_type_): Discord bot object
+        discord (_type_): Discord object
+        payload (_type_): Discord on_raw_reation_add payload object
+    """
+
+    # the bot's own answer reactions stay
+    if payload.member is not None and payload.member.bot:
+        return
+
+    current_verify: dict[str, Any] = await verify_store.load_verify_answer(
+        guild_id=payload.guild_id
+    )
+    if not verify.is_verification_message(
+        message_id=payload.message_id, current_verify=current_verify
+    ):
+        return
+
+    queue: ReactionQueue = reaction_queues.setdefault(payload.guild_id, ReactionQueue())
+    member_id: int = payload.user_id
+    prune_answered(queue=queue, now=time.monotonic())
+
+    if (
+        member_id in queue.payloads
+        or member_id in queue.in_flight
+        or member_id in queue.answered
+    ):
+        if payload.member is not None:
+            verify.remove_reaction(
+                message=bot.get_channel(payload.channel_id).get_partial_message(
+                    payload.message_id
+                ),
+                emoji=payload.emoji,
+                member=payload.member,
+            )
+        return
+
+    queue.payloads[member_id] = payload
+
+    if len(queue.workers) < VERIFY_WORKER_CONCURRENCY:
+        queue.workers.add(
+            asyncio.create_task(
+                run_worker(bot=bot, discord=discord, guild_id=payload.guild_id)
+            )
+        )
+
+
+# helper functions
+async def run_worker(bot, discord, guild_id: int) -> None:
+    """
+    Checks a guild's queued answers in batches until the queue is empty
+
+    Args:
+        bot (_type_): Discord bot object
+        discord (_type_): Discord object
+        guild_id (int): ID of the guild
+    """
+
+    queue: ReactionQueue = reaction_queues[guild_id]
+
+    try:
+        while queue.payloads:
+            member_ids: list[int] = list(queue.payloads)[:VERIFY_BATCH_SIZE]
+            payloads: list = [queue.payloads.pop(member_id) for member_id in member_ids]
+            queue.in_flight.update(member_ids)
+
+            actions: dict[int, asyncio.Future] = {}
+            try:
+                actions = (
+                    await verify.check_verifications(
+                        bot=bot, discord=discord, guild_id=guild_id, payloads=payloads
+                    )
+                    or {}
+                )
+
+            finally:
+                # members stay marked until their role grant/kick went through
+                for member_id in member_ids:
+                    action: asyncio.Future | None = actions.get(member_id)
+                    if action is None:
+                        mark_answered(queue=queue, member_id=member_id)
+                    else:
+                        action.add_done_callback(
+                            lambda _, member_id=member_id: mark_answered(
+                                queue=queue, member_id=member_id
+                            )
+                        )
+
+    finally:
+        queue.workers.discard(asyncio.current_task())  # type: ignore
+
+
+def mark_answered(queue: ReactionQueue, member_id: int) -> None:
+    """
+    Moves a checked member from in flight to answered for
+    VERIFY_ANSWERED_SECONDS
+
+    Args:
+        queue (ReactionQueue): The guild's queue
+        member_id (int): ID of the member
+    """
+
+    queue.in_flight.discard(member_id)
+    queue.answered.add(member_id)
+    queue.answered_expiry.append(
+        (time.monotonic() + VERIFY_ANSWERED_SECONDS, member_id)
+    )
+
+
+def prune_answered(queue: ReactionQueue, now: float) -> None:
+    """
+    Forgets answered members whose VERIFY_ANSWERED_SECONDS are up
+
+    Args:
+        queue (ReactionQueue): The guild's queue
+        now (float): time.monotonic()
+    """
+
+    while queue.answered_expiry and queue.answered_expiry[0][0] <= now:
+        _, member_id = queue.answered_expiry.popleft()
+        queue.answered.discard(member_id)
@@ -0,0 +1,317 @@
+"""
+Verification question rotation.
+
+Each guild keeps a pool of up to VERIFY_POOL_SIZE questions. The current one is
+shown by editing the verification message in place, so its reactions are
+reused, and the next question in the pool replaces it every
+VERIFY_ROTATE_SECONDS. Everything else in the verify channel is deleted in
+small background batches instead of purging the whole channel.
+"""
+
+# imports
+import asyncio
+import functools
+import time
+from typing import Any
+
+import services.shared.executor as executor
+import services.verify.functions as verify
+import services.verify.store as verify_store
+from config import logger
+from services.shared.vars import ACTION_PRIORITY_DELETE
+from services.verify.vars import (
+    BULK_DELETE_MAX_AGE_SECONDS,
+    VERIFY_CLEANUP_BATCH,
+    VERIFY_CLEANUP_PAUSE_SECONDS,
+    VERIFY_POOL_SIZE,
+    VERIFY_ROTATE_CHECK_SECONDS,
+    VERIFY_ROTATE_SECONDS,
+    reaction_emojis,
+)
+
+QUESTION_KEYS: tuple[str, ...] = (
+    "correct_answer",
+    "correct_value",
+    "question",
+    "answer",
+    "choice_a",
+    "choice_b",
+    "choice_c",
+    "choice_d",
+    "url",
+)
+
+rotation_task: asyncio.Task | None = None
+cleanup_tasks: dict[int, asyncio.Task] = {}
+
+
+# entry functions
+def start_rotation(bot, discord) -> None:
+    """
+    Starts the background task that rotates every guild's question
+
+    Args:
+        bot (_type_): Discord bot object
+        discord (_type_): Discord object
+    """
+
+    global rotation_task  # pylint: disable=global-statement
+
+    if rotation_task is None or rotation_task.done():
+        rotation_task = asyncio.create_task(run_rotation(bot=bot, discord=discord))
+
+
+async def add_question(discord, channel, question: dict[str, str]) -> bool:
+    """
+    Adds a question to the guild's pool and shows it right away
+
+    Args:
+        discord (_type_): Discord object
+        channel (_type_): Verify channel object
+        question (dict[str, str]): The question's fields (QUESTION_KEYS)
+
+    Returns:
+        bool: The question was saved
+    """
+
+    current_verify: dict[str, Any] = await verify_store.load_verify_answer(
+        guild_id=channel.guild.id
+    )
+
+    pool: list[dict[str, str]] = [
+        entry
+        for entry in get_pool(current_verify=current_verify)
+        if (entry["question"], entry["url"]) != (question["question"], question["url"])
+    ]
+    pool = (pool + [question])[-VERIFY_POOL_SIZE:]
+
+    return await show_question(
+        discord=discord,
+        channel=channel,
+        current_verify=current_verify,
+        pool=pool,
+        pool_index=len(pool) - 1,
+    )
+
+
+def schedule_cleanup(channel) -> None:
+    """
+    Deletes stray messages of the verify channel in the background
+
+    Args:
+        channel (_type_): Verify channel object
+    """
+
+    task: asyncio.Task | None = cleanup_tasks.get(channel.id)
+    if task is None or task.done():
+        cleanup_tasks[channel.id] = asyncio.create_task(
+            logger.catch(clean_channel)(channel=channel)
+        )
+
+
+# helper functions
+async def run_rotation(bot, discord) -> None:
+    """
+    Rotates questions that are due every VERIFY_ROTATE_CHECK_SECONDS
+
+    Args:
+        bot (_type_): Discord bot object
+        discord (_type_): Discord object
+    """
+
+    while True:
+        for guild in bot.guilds:
+            await logger.catch(rotate_if_due)(discord=discord, guild=guild)
+
+        await asyncio.sleep(VERIFY_ROTATE_CHECK_SECONDS)
+
+
+async def rotate_if_due(discord, guild) -> None:
+    """
+    Shows the next question of the guild's pool once the current one is due
+
+    Args:
+        discord (_type_): Discord object
+        guild (_type_): Guild object
+    """
+
+    current_verify: dict[str, Any] = await verify_store.load_verify_answer(
+        guild_id=guild.id
+    )
+    pool: list[dict[str, str]] = get_pool(current_verify=current_verify)
+
+    if len(pool) < 2:
+        return
+
+    if time.time() - current_verify.get("rotated_at", 0) < VERIFY_ROTATE_SECONDS:
+        return
+
+    channel = verify.get_verification_channel(guild=guild)
+    if channel is None:
+        return
+
+    pool_index: int = (current_verify.get("pool_index", 0) + 1) % len(pool)
+    if await show_question(
+        discord=discord,
+        channel=channel,
+        current_verify=current_verify,
+        pool=pool,
+        pool_index=pool_index,
+    ):
+        logger.info(f"• ROTATED VERIFICATION QUESTION: {guild.name}")
+
+
+async def show_question(
+    discord, channel, current_verify: dict[str, Any], pool: list, pool_index: int
+) -> bool:
+    """
+    Edits the verification message to a question of the pool (sends a new
+    message with reactions only if there is none) and saves it as current
+
+    Args:
+        discord (_type_): Discord object
+        channel (_type_): Verify channel object
+        current_verify (dict[str, Any]): The guild's current verification
+        pool (list): The guild's question pool
+        pool_index (int): Position of the question to show
+
+    Returns:
+        bool: The question was saved
+    """
+
+    question: dict[str, str] = pool[pool_index]
+    embed = await verify.create_verification_question(
+        discord=discord,
+        question=question["question"],
+        a=question["choice_a"],
+        b=question["choice_b"],
+        c=question["choice_c"],
+        d=question["choice_d"],
+        url=question["url"],
+    )
+
+    msg_id: Any = current_verify.get("msgID")
+    edited: bool = False
+
+    if msg_id is not None:
+        try:
+            await channel.get_partial_message(int(msg_id)).edit(embed=embed)
+            edited = True
+
+        except discord.NotFound:
+            pass
+
+    if not edited:
+        verification_msg = await channel.send(embed=embed)
+        for emoji in reaction_emojis.values():
+            await verification_msg.add_reaction(emoji)
+        msg_id = verification_msg.id
+
+    saved: bool = await verify_store.save_verify_answer(
+        guild_id=channel.guild.id,
+        values={
+            **question,
+            "msgID": str(object=msg_id),
+            "pool": pool,
+            "pool_index": pool_index,
+            "rotated_at": time.time(),
+        },
+        base_version=current_verify.get("version", 0),
+    )
+
+    schedule_cleanup(channel=channel)
+    return saved
+
+
+def get_pool(current_verify: dict[str, Any]) -> list[dict[str, str]]:
+    """
+    Gets a guild's question pool (just the current question for guilds saved
+    before pools existed)
+
+    Args:
+        current_verify (dict[str, Any]): The guild's current verification
+
+    Returns:
+        list[dict[str, str]]: The question pool
+    """
+
+    if "pool" in current_verify:
+        return list(current_verify["pool"])
+
+    if "question" in current_verify:
+        return [{key: current_verify[key] for key in QUESTION_KEYS}]
+
+    return []
+
+
+async def clean_channel(channel) -> None:
+    """
+    Deletes everything but the verification message, VERIFY_CLEANUP_BATCH
+    messages at a time with a pause in between
+
+    Args:
+        channel (_type_): Verify channel object
+    """
+
+    while True:
+        current_verify: dict[str, Any] = await verify_store.load_verify_answer(
+            guild_id=channel.guild.id
+        )
+        keep_id: str = str(object=current_verify.get("msgID"))
+
+        strays: list = [
+            message
+            async for message in channel.history(limit=VERIFY_CLEANUP_BATCH + 1)
+            if str(object=message.id) != keep_id
+        ][:VERIFY_CLEANUP_BATCH]
+
+        if not strays:
+            return
+
+        bulk_after: float = time.time() - BULK_DELETE_MAX_AGE_SECONDS
+        recent: list = [
+            message for message in strays if message.created_at.timestamp() > bulk_after
+        ]
+        old: list = [
+            message
+            for message in strays
+            if message.created_at.timestamp() <= bulk_after
+        ]
+
+        actions: list[asyncio.Future] = [
+            submit_delete(channel=channel, action=message.delete) for message in old
+        ]
+        if recent:
+            actions.append(
+                submit_delete(
+                    channel=channel,
+                    action=functools.partial(channel.delete_messages, recent),
+                )
+            )
+
+        if not all(await asyncio.gather(*actions)):
+            logger.error(f"• VERIFY CLEANUP STOPPED: {channel.guild.name}")
+            return
+
+        logger.info(f"• VERIFY CLEANUP: {len(strays)} messages in {channel.guild.name}")
+        await asyncio.sleep(VERIFY_CLEANUP_PAUSE_SECONDS)
+
+
+def submit_delete(channel, action) -> asyncio.Future:
+    """
+    Queues a delete in the verify channel with the action executor
+
+    Args:
+        channel (_type_): Verify channel object
+        action (_type_): Makes the delete call
+
+    Returns:
+        asyncio.Future: Resolves to True once the delete went through
+    """
+
+    return executor.submit(
+        guild_id=channel.guild.id,
+        priority=ACTION_PRIORITY_DELETE,
+        route=f"delete:{channel.id}",
+        action=action,
+    )
@@ -0,0 +1,232 @@
+"""
+Per-guild verification store.
+
+Each guild's verification question lives in its own row of a SQLite database
+(WAL mode, so the bot's reads never wait on a write). Rows are read once and
+then served from an in-process cache; saves are version-stamped and rejected
+when they were derived from an older version. Database calls run off the event
+loop on one shared connection.
+"""
+
+# imports
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from typing import Any
+
+from config import logger
+
+VERIFY_DB_FILEPATH: str = os.path.join(
+    os.getcwd(), "src", "services", "verify", ".verify.db"
+)
+LEGACY_VERIFICATION_FILEPATH: str = os.path.join(
+    os.getcwd(), "src", "services", "verify", ".currentVerify.json"
+)
+
+CREATE_TABLE_SQL: str = """
+    CREATE TABLE IF NOT EXISTS verification (
+        guild_id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL,
+        data TEXT NOT NULL
+    )
+"""
+SELECT_SQL: str = "SELECT version, data FROM verification WHERE guild_id = ?"
+INSERT_SQL: str = "INSERT INTO verification (guild_id, version, data) VALUES (?, ?, ?)"
+UPDATE_SQL: str = (
+    "UPDATE verification SET version = ?, data = ? WHERE guild_id = ? AND version = ?"
+)
+
+connection: sqlite3.Connection | None = None
+connection_lock = threading.Lock()
+verify_cache: dict[int, dict[str, Any]] = {}
+
+
+# entry functions
+async def load_verify_answer(guild_id: int) -> dict[str, Any]:
+    """
+    Gets a guild's verification answers, reading the database only on the
+    first lookup. The returned dict is never changed in place.
+
+    Args:
+        guild_id (int): ID of the guild
+
+    Returns:
+        dict[str, Any]: The guild's verification answers (with their version),
+        empty if the guild has none
+    """
+
+    values: dict[str, Any] | None = verify_cache.get(guild_id)
+    if values is None:
+        values = await asyncio.to_thread(read_verify_answer, guild_id)
+        values = verify_cache.setdefault(guild_id, values)
+
+    return values
+
+
+async def save_verify_answer(
+    guild_id: int, values: dict[str, Any], base_version: int | None = None
+) -> bool:
+    """
+    Stamps a guild's verification answers with the next version and saves them
+
+    Args:
+        guild_id (int): ID of the guild
+        values (dict[str, Any]): The new verification answers
+        base_version (int | None, optional): Version the values were derived
+        from, the save is rejected if another save came in between. Defaults
+        to None.
+
+    Returns:
+        bool: The answers were saved
+    """
+
+    version: int = (await load_verify_answer(guild_id=guild_id)).get("version", 0)
+    if base_version is None:
+        base_version = version
+
+    new_values: dict[str, Any] = {**values, "version": base_version + 1}
+    saved: bool = await asyncio.to_thread(
+        write_verify_answer, guild_id, new_values, base_version
+    )
+
+    if not saved:
+        logger.warning(
+            f"• VERIFY SAVE REJECTED: guild {guild_id}, based on v{base_version}"
+        )
+        verify_cache.pop(guild_id, None)
+        return False
+
+    verify_cache[guild_id] = new_values
+    return True
+
+
+async def load_legacy_answers() -> dict[str, Any]:
+    """
+    Gets the old single-guild json answers
+
+    Returns:
+        dict[str, Any]: The answers, empty if there is no file
+    """
+
+    return await asyncio.to_thread(read_legacy_answers)
+
+
+async def migrate_legacy_answers(guild_id: int, values: dict[str, Any]) -> None:
+    """
+    Copies the old single-guild json answers to a guild that has none yet
+
+    Args:
+        guild_id (int): ID of the guild the json file belonged to
+        values (dict[str, Any]): The old answers (load_legacy_answers)
+    """
+
+    if await load_verify_answer(guild_id=guild_id):
+        return
+
+    await save_verify_answer(guild_id=guild_id, values=values)
+    logger.info(f"• MIGRATED VERIFICATION ANSWERS: guild {guild_id}")
+
+
+# helper functions
+def get_connection() -> sqlite3.Connection:
+    """
+    Opens the database on first use (WAL mode, table created if missing)
+
+    Returns:
+        sqlite3.Connection: The shared connection
+    """
+
+    global connection  # pylint: disable=global-statement
+
+    if connection is None:
+        connection = sqlite3.connect(
+            database=VERIFY_DB_FILEPATH, check_same_thread=False, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(CREATE_TABLE_SQL)
+
+    return connection
+
+
+def read_verify_answer(guild_id: int) -> dict[str, Any]:
+    """
+    Reads a guild's verification answers from the database
+
+    Args:
+        guild_id (int): ID of the guild
+
+    Returns:
+        dict[str, Any]: The verification answers, empty if there are none
+    """
+
+    with connection_lock:
+        row: tuple[int, str] | None = (
+            get_connection().execute(SELECT_SQL, (guild_id,)).fetchone()
+        )
+
+    if row is None:
+        return {}
+
+    return {**json.loads(s=row[1]), "version": row[0]}
+
+
+def write_verify_answer(
+    guild_id: int, values: dict[str, Any], base_version: int
+) -> bool:
+    """
+    Writes a guild's verification answers if the row is still at base_version
+
+    Args:
+        guild_id (int): ID of the guild
+        values (dict[str, Any]): The verification answers (with their version)
+        base_version (int): Version the row must be at (0 = no row yet)
+
+    Returns:
+        bool: The row was written
+    """
+
+    data: str = json.dumps(obj={k: v for k, v in values.items() if k != "version"})
+
+    with connection_lock:
+        db: sqlite3.Connection = get_connection()
+
+        if base_version == 0:
+            try:
+                db.execute(INSERT_SQL, (guild_id, values["version"], data))
+                return True
+
+            except sqlite3.IntegrityError:
+                return False
+
+        cursor: sqlite3.Cursor = db.execute(
+            UPDATE_SQL, (values["version"], data, guild_id, base_version)
+        )
+        return cursor.rowcount == 1
+
+
+def read_legacy_answers() -> dict[str, Any]:
+    """
+    Reads the old single-guild answers json file
+
+    Returns:
+        dict[str, Any]: The answers, empty if there is no file
+    """
+
+    values: dict[str, Any] = {}
+
+    try:
+        with open(
+            file=LEGACY_VERIFICATION_FILEPATH, mode="r", encoding="utf-8"
+        ) as file:
+            values = json.load(fp=file)
+
+    except FileNotFoundError:
+        pass
+
+    except json.JSONDecodeError:
+        logger.critical("Could not load legacy verification answers.")
+
+    return values
@@ -8,3 +8,19 @@ reaction_emojis: dict[str, str] = {
     "c_emoji": "🇨",
     "d_emoji": "🇩",
 }
+
+# question rotation
+VERIFY_POOL_SIZE: int = 10  # questions kept per guild
+VERIFY_ROTATE_SECONDS: float = 7 * 24 * 60 * 60.0
+VERIFY_ROTATE_CHECK_SECONDS: float = 600.0
+
+# stray message cleanup in the verify channel
+VERIFY_CLEANUP_BATCH: int = 50
+VERIFY_CLEANUP_PAUSE_SECONDS: float = 5.0
+BULK_DELETE_MAX_AGE_SECONDS: float = 13 * 24 * 60 * 60.0  # Discord's limit is 14 days
+
+# verification reaction queue
+VERIFY_WORKER_CONCURRENCY: int = 2  # batches checked at once per guild
+VERIFY_BATCH_SIZE: int = 25
+# seconds the later reactions of a checked member are still just removed
+VERIFY_ANSWERED_SECONDS: float = 30.0
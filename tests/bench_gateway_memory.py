@@ -0,0 +1,305 @@
+"""
+Memory of the default vs LEAN_GATEWAY options across simulated guild sizes.
+
+Builds a discord.py ConnectionState with each option set from
+gateway.get_bot_options and feeds it fake payloads for a guild of the given size
+(MOD_COUNT of them mods): the startup chunk when the options chunk at startup,
+then a first message, which looks up the mod roster through
+shared.get_mod_info like every service does, then enough messages to fill the
+message cache. REST member pages and gateway member queries are answered from
+the same fake member list. Each case runs in its own process and reports the
+members cached at the end, the memory traced meanwhile and the peak RSS.
+
+    python tests/bench_gateway_memory.py [guild sizes ...]
+"""
+
+# imports
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+
+import discord
+from discord.state import ConnectionState
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+# pylint: disable=wrong-import-position,protected-access,unused-argument
+import config  # noqa: E402
+import services.shared.functions as shared  # noqa: E402
+import services.shared.gateway as gateway  # noqa: E402
+
+GUILD_SIZES: list[int] = [1_000, 10_000, 50_000]
+MOD_COUNT: int = 20
+GUILD_ID: int = 1
+CHANNEL_ID: int = 2
+MOD_ROLE_ID: int = 3
+FIRST_MEMBER_ID: int = 1_000
+TIMESTAMP: str = datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat()
+
+
+# entry functions
+def main() -> None:
+    """
+    Runs every (mode, guild size) case in a fresh process and prints a table
+    """
+
+    if len(sys.argv) == 4 and sys.argv[1] == "--case":
+        print(*run_case(lean=sys.argv[2] == "lean", guild_size=int(sys.argv[3])))
+        return
+
+    guild_sizes: list[int] = [int(arg) for arg in sys.argv[1:]] or GUILD_SIZES
+
+    print(f"{'members':>8} {'mode':>7} {'cached':>8} {'traced MiB':>11} {'RSS MiB':>8}")
+    for guild_size in guild_sizes:
+        for mode in ("default", "lean"):
+            output: str = subprocess.run(
+                [sys.executable, __file__, "--case", mode, str(guild_size)],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+            cached, traced, rss = output.split()
+            print(
+                f"{guild_size:>8} {mode:>7} {cached:>8} "
+                f"{int(traced) / 2**20:>11.1f} {int(rss) / 2**10:>8.1f}"
+            )
+
+
+# helper functions
+class BenchState(ConnectionState):
+    """
+    ConnectionState answering gateway member queries from the fake members
+    """
+
+    async def query_members(  # pylint: disable=too-many-arguments
+        self, guild, query, limit, user_ids, cache, presences
+    ):
+        members: list = [
+            discord.Member(
+                data=get_member_payload(user_id=user_id), guild=guild, state=self
+            )
+            for user_id in user_ids
+        ]
+        if cache:
+            for member in members:
+                guild._add_member(member)
+
+        return members
+
+
+class BenchHTTP:
+    """
+    HTTP client answering REST member pages from the fake members
+    """
+
+    def __init__(self, guild_size: int) -> None:
+        self.guild_size: int = guild_size
+
+    async def get_members(self, guild_id: int, limit: int, after: int | None):
+        start: int = max(FIRST_MEMBER_ID, (after or 0) + 1)
+        end: int = min(FIRST_MEMBER_ID + self.guild_size, start + limit)
+        return [get_member_payload(user_id=user_id) for user_id in range(start, end)]
+
+
+class BenchBot:
+    """
+    The bits of the bot get_mod_info uses
+    """
+
+    def __init__(self, state: ConnectionState) -> None:
+        self.state: ConnectionState = state
+
+    def get_guild(self, guild_id: int):
+        return self.state._get_guild(guild_id)
+
+
+def run_case(lean: bool, guild_size: int) -> tuple[int, int, int]:
+    """
+    Runs a guild's startup and first events with one option set
+
+    Args:
+        lean (bool): Use the LEAN_GATEWAY options
+        guild_size (int): Members of the simulated guild
+
+    Returns:
+        tuple[int, int, int]: Cached members, bytes traced meanwhile, peak RSS
+        in KiB
+    """
+
+    config.LEAN_GATEWAY = lean
+    config.MOD_ROLE_NAME = "Moderator"
+    options: dict = gateway.get_bot_options(discord=discord)
+
+    tracemalloc.start()
+
+    state = BenchState(
+        dispatch=lambda *args, **kwargs: None,
+        handlers={},
+        hooks={},
+        http=BenchHTTP(guild_size=guild_size),  # type: ignore
+        **options,
+    )
+    guild = state._add_guild_from_data(get_guild_payload(guild_size=guild_size))
+
+    # the startup chunk, members and their presences
+    if state._chunk_guilds:
+        for user_id in range(FIRST_MEMBER_ID, FIRST_MEMBER_ID + guild_size):
+            member = discord.Member(
+                data=get_member_payload(user_id=user_id), guild=guild, state=state
+            )
+            guild._add_member(member)
+            if state._intents.presences:
+                member._presence_update(get_presence_payload(user_id=user_id), ())
+
+    # the first message, and the roster lookup every service does on it
+    state.parse_message_create(get_message_payload(message_id=10**6))  # type: ignore
+    asyncio.run(shared.get_mod_info(bot=BenchBot(state=state), guild_id=GUILD_ID))
+
+    for message_id in range(1, state.max_messages or 0):
+        state.parse_message_create(
+            get_message_payload(message_id=10**6 + message_id)  # type: ignore
+        )
+
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (
+        len(guild.members),
+        traced,
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    )
+
+
+def get_guild_payload(guild_size: int) -> dict:
+    """
+    Gets a GUILD_CREATE payload of a large guild (no members, they arrive in
+    chunks)
+
+    Args:
+        guild_size (int): Members of the guild
+
+    Returns:
+        dict: Guild payload
+    """
+
+    return {
+        "id": str(GUILD_ID),
+        "name": "bench",
+        "owner_id": str(FIRST_MEMBER_ID),
+        "roles": [
+            {
+                "id": str(GUILD_ID),
+                "name": "@everyone",
+                "permissions": "0",
+                "position": 0,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            },
+            {
+                "id": str(MOD_ROLE_ID),
+                "name": "Moderator",
+                "permissions": "0",
+                "position": 1,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            },
+        ],
+        "channels": [
+            {"id": str(CHANNEL_ID), "type": 0, "name": "general", "position": 0}
+        ],
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "member_count": guild_size,
+    }
+
+
+def get_member_payload(user_id: int) -> dict:
+    """
+    Gets a guild member payload, the first MOD_COUNT members are mods
+
+    Args:
+        user_id (int): ID of the member
+
+    Returns:
+        dict: Member payload
+    """
+
+    return {
+        "user": {
+            "id": str(user_id),
+            "username": f"member{user_id}",
+            "global_name": f"Member {user_id}",
+            "discriminator": "0",
+            "avatar": None,
+        },
+        "nick": None,
+        "roles": [str(MOD_ROLE_ID)] if user_id < FIRST_MEMBER_ID + MOD_COUNT else [],
+        "joined_at": TIMESTAMP,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def get_presence_payload(user_id: int) -> dict:
+    """
+    Gets a presence payload, one activity per member
+
+    Args:
+        user_id (int): ID of the member
+
+    Returns:
+        dict: Presence payload
+    """
+
+    return {
+        "user": {"id": str(user_id)},
+        "status": "online",
+        "activities": [{"name": "Trading", "type": 0, "created_at": 0}],
+        "client_status": {"desktop": "online"},
+    }
+
+
+def get_message_payload(message_id: int) -> dict:
+    """
+    Gets a guild message payload
+
+    Args:
+        message_id (int): ID of the message
+
+    Returns:
+        dict: Message payload
+    """
+
+    return {
+        "id": str(message_id),
+        "channel_id": str(CHANNEL_ID),
+        "guild_id": str(GUILD_ID),
+        "author": get_member_payload(user_id=FIRST_MEMBER_ID + message_id % 500)[
+            "user"
+        ],
+        "content": "gm, anyone watching the open today?",
+        "timestamp": TIMESTAMP,
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Cost of username normalization: the old clean_username vs the skeleton-based
+one, cold (every name new) and warm (a raid-like stream of repeating names,
+served from the LRU cache).
+
+The names mix plain ascii, accented, fullwidth, Cyrillic/Greek look-alike and
+punctuated variants of a few mod names. The old implementation (regex for
+punctuation, one str.replace per MAPPING entry, unidecode) is copied here as it
+was before the translate table and the skeleton.
+
+    python tests/bench_normalization.py [unique names] [stream length]
+"""
+
+# imports
+import os
+import random
+import re
+import string
+import sys
+import time
+
+import unidecode
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+# pylint: disable=wrong-import-position
+import services.imposter.functions as imposter  # noqa: E402
+import services.shared.functions as shared  # noqa: E402
+from services.imposter.vars import MAPPING  # noqa: E402
+
+UNIQUE_NAMES: int = 5_000
+STREAM_LENGTH: int = 50_000
+BASE_NAMES: list[str] = ["gary", "moderator", "tradingsupport", "annabelle"]
+LOOK_ALIKES: dict[str, str] = {
+    "a": "аα",
+    "e": "еε",
+    "o": "оο0",
+    "i": "іι1",
+    "r": "г",
+    "p": "р",
+    "c": "с",
+}
+
+
+# entry functions
+def main() -> None:
+    """
+    Times every implementation and prints a table
+    """
+
+    unique_count: int = int(sys.argv[1]) if len(sys.argv) > 1 else UNIQUE_NAMES
+    stream_length: int = int(sys.argv[2]) if len(sys.argv) > 2 else STREAM_LENGTH
+
+    rng = random.Random(7)
+    names: list[str] = list(
+        dict.fromkeys(get_name(rng=rng) for _ in range(unique_count * 2))
+    )[:unique_count]
+    # raids repeat the same few names, most lookups hit a small share of them
+    stream: list[str] = rng.choices(
+        names, weights=[1 / (rank + 1) for rank in range(len(names))], k=stream_length
+    )
+
+    print(f"{'implementation':<26} {'calls':>7} {'us/call':>8} {'hit rate':>9}")
+
+    print_row(label="old clean_username", names=names, clean=old_clean_username)
+    print_row(label="old clean_username stream", names=stream, clean=old_clean_username)
+    print_row(
+        label="skeleton",
+        names=names,
+        clean=lambda username: shared.skeleton(text=username),
+    )
+
+    imposter.clean_username_cached.cache_clear()
+    print_row(label="clean_username cold", names=names, clean=imposter.clean_username)
+
+    imposter.clean_username_cached.cache_clear()
+    print_row(
+        label="clean_username stream", names=stream, clean=imposter.clean_username
+    )
+
+
+# helper functions
+def print_row(label: str, names: list[str], clean) -> None:
+    """
+    Times one implementation over a list of names and prints its row
+
+    Args:
+        label (str): Row label
+        names (list[str]): Names to clean, in order
+        clean (_type_): Cleans one name
+    """
+
+    started: float = time.perf_counter()
+    for name in names:
+        clean(name)
+    elapsed: float = time.perf_counter() - started
+
+    hit_rate: str = "-"
+    if label.startswith("clean_username"):
+        hit_rate = f"{imposter.clean_username_cache_stats()['hit_rate']:.1%}"
+
+    print(
+        f"{label:<26} {len(names):>7} {elapsed / len(names) * 1e6:>8.2f} {hit_rate:>9}"
+    )
+
+
+def get_name(rng: random.Random) -> str:
+    """
+    Gets a random joiner name, usually a disguised mod name
+
+    Args:
+        rng (random.Random): Seeded random generator
+
+    Returns:
+        str: The name
+    """
+
+    if rng.random() < 0.3:
+        return "".join(
+            rng.choice(string.ascii_letters + string.digits)
+            for _ in range(rng.randint(4, 16))
+        )
+
+    chars: list[str] = []
+    for char in rng.choice(BASE_NAMES):
+        roll: float = rng.random()
+        if roll < 0.2 and char in LOOK_ALIKES:
+            chars.append(rng.choice(LOOK_ALIKES[char]))
+        elif roll < 0.3:
+            chars.append(chr(ord(char) - ord("a") + ord("ａ")))  # fullwidth
+        elif roll < 0.35:
+            chars.append(char + "\u0301")  # combining acute accent
+        else:
+            chars.append(char.upper() if rng.random() < 0.2 else char)
+
+    if rng.random() < 0.3:
+        chars.append(rng.choice("._-!") + str(rng.randint(0, 99)))
+
+    return "".join(chars)
+
+
+def old_clean_username(username: str) -> str:
+    """
+    clean_username before the translate table and the skeleton
+
+    Args:
+        username (str): The name that is getting cleaned
+
+    Returns:
+        str: The cleaned username string
+    """
+
+    cleaned_username: str = re.sub(
+        pattern=f"[{re.escape(pattern=string.punctuation)}]", repl="", string=username
+    )
+
+    for key, value in MAPPING.items():
+        cleaned_username = cleaned_username.replace(key, value)
+
+    return unidecode.unidecode(string=cleaned_username).lower()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+Puts src on the import path, the bot imports its services from there
+"""
+
+# imports
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
@@ -0,0 +1,170 @@
+"""
+Checks the pruned similarity search against a brute-force difflib loop
+"""
+
+# imports
+import difflib
+import random
+import string
+
+import pytest
+
+from services.imposter.mod_index import ModNameIndex, build_mod_name_index
+from services.imposter.similarity import get_highest_similarity, score_name_matrix
+from services.imposter.vars import BAN_THRESHOLD, KICK_THRESHOLD
+
+MOD_NAMES: list[str] = [
+    "TheProgrammerGary",
+    "gary",
+    "Mod_Anna",
+    "annabelle",
+    "TradingSupport",
+    "support",
+    "StockWizard",
+    "wizard99",
+    "chartqueen",
+    "b",
+    "Nightwatch",
+    "nightowl",
+]
+
+
+def get_decision(similarity: float) -> int:
+    """
+    Gets the verdict for a similarity %
+
+    Args:
+        similarity (float): Similarity %
+
+    Returns:
+        int: 2 = ban, 1 = kick, 0 = pass
+    """
+
+    if similarity >= BAN_THRESHOLD:
+        return 2
+
+    if similarity >= KICK_THRESHOLD:
+        return 1
+
+    return 0
+
+
+def brute_force(names: list[str], mod_index: ModNameIndex) -> float:
+    """
+    Highest similarity % of any name against any mod, scoring every pair
+
+    Args:
+        names (list[str]): Cleaned names
+        mod_index (ModNameIndex): Mod name index
+
+    Returns:
+        float: Highest similarity %
+    """
+
+    return max(
+        (
+            round(difflib.SequenceMatcher(a=name, b=mod.name).ratio() * 100, 2)
+            for mod in mod_index.entries
+            for name in names
+        ),
+        default=0.00,
+    )
+
+
+def get_corpus() -> list[tuple[str, str]]:
+    """
+    Fixed (username, nickname) pairs: edits of the mod names and random names
+
+    Returns:
+        list[tuple[str, str]]: The names, cleaned (lowercase)
+    """
+
+    rng = random.Random(4242)
+    alphabet: str = string.ascii_lowercase + string.digits
+    mods: list[str] = [mod.lower() for mod in MOD_NAMES]
+
+    def edit(name: str) -> str:
+        chars: list[str] = list(name)
+        for _ in range(rng.randint(0, 3)):
+            position: int = rng.randrange(len(chars) + 1)
+            operation: int = rng.randrange(3)
+            if operation == 0:
+                chars.insert(position, rng.choice(alphabet))
+            elif chars and operation == 1:
+                del chars[min(position, len(chars) - 1)]
+            elif chars:
+                chars[min(position, len(chars) - 1)] = rng.choice(alphabet)
+        return "".join(chars)
+
+    def random_name() -> str:
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 16)))
+
+    corpus: list[tuple[str, str]] = [(mod, "") for mod in mods]
+    for _ in range(400):
+        username: str = edit(rng.choice(mods)) if rng.random() < 0.6 else random_name()
+        nickname: str = edit(rng.choice(mods)) if rng.random() < 0.3 else ""
+        corpus.append((username, nickname))
+
+    return corpus
+
+
+@pytest.fixture(name="mod_index", scope="module")
+def fixture_mod_index() -> ModNameIndex:
+    """
+    Mod name index of the fixed mod names
+    """
+
+    return build_mod_name_index(mod_names=MOD_NAMES, version=1, normalize=str.lower)
+
+
+@pytest.mark.parametrize("username, nickname", get_corpus())
+def test_highest_similarity_matches_brute_force(
+    username: str, nickname: str, mod_index: ModNameIndex
+) -> None:
+    """
+    get_highest_similarity reaches the same kick/ban decision as scoring every
+    pair, with the exact % below the ban threshold (it stops at the first ban)
+    """
+
+    names: list[str] = [name for name in (nickname, username) if name]
+    expected: float = brute_force(names=names, mod_index=mod_index)
+
+    similarity, name, mod = get_highest_similarity(
+        names=[("nick", nickname), ("user", username)], mod_index=mod_index
+    )
+
+    assert get_decision(similarity=similarity) == get_decision(similarity=expected)
+    if get_decision(similarity=expected) == 1:
+        assert similarity == expected
+
+    if similarity:
+        actual: float = difflib.SequenceMatcher(a=name, b=mod).ratio() * 100
+        assert round(actual, 2) == similarity
+
+
+def test_score_name_matrix_matches_brute_force(mod_index: ModNameIndex) -> None:
+    """
+    score_name_matrix reaches the same kick/ban decision per name as scoring
+    every pair, also when the names are split over several chunks
+    """
+
+    names: list[str] = [name for pair in get_corpus() for name in pair if name]
+
+    for max_cells in (2_000_000, 500):
+        scores, mod_positions = score_name_matrix(
+            names=names, mod_index=mod_index, max_cells=max_cells
+        )
+
+        for name, score, mod_position in zip(names, scores, mod_positions):
+            expected: float = brute_force(names=[name], mod_index=mod_index)
+
+            assert get_decision(similarity=score) == get_decision(similarity=expected)
+            if get_decision(similarity=expected) == 1:
+                assert score == expected
+
+            if mod_position >= 0:
+                mod: str = mod_index.entries[mod_position].name
+                actual: float = difflib.SequenceMatcher(a=name, b=mod).ratio() * 100
+                assert round(actual, 2) == score
+            else:
+                assert score == 0